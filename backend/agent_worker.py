@@ -10,13 +10,15 @@ def main() -> None:
     try:
         from livekit import agents
         from app.agents.interviewer import entrypoint
+        from app.agents.warmup import prewarm
     except Exception as exc:  # pragma: no cover
         raise SystemExit(f"Missing livekit-agents or agent code not importable: {exc}")
 
     # Start a local worker that connects to LiveKit Cloud. The agent uses
     # our interviewer entrypoint. If you want to pass resume/job context,
     # adapt entrypoint to fetch them from room metadata or an API.
-    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint))
+    # prewarm loads the VAD once per worker process instead of once per job.
+    agents.cli.run_app(agents.WorkerOptions(entrypoint_fnc=entrypoint, prewarm_fnc=prewarm))
 
 
 if __name__ == "__main__":
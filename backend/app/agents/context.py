@@ -0,0 +1,168 @@
+import asyncio
+import logging
+import os
+from typing import Any, Awaitable, Callable
+
+from ..services.transcript import CHARS_PER_TOKEN, estimate_tokens, truncate_to_tokens
+
+# Lazy import heavy deps so the API can start without them installed locally
+try:
+    from livekit.agents import ChatContext  # type: ignore[import-not-found]
+    from cerebras.cloud.sdk import AsyncCerebras  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    ChatContext = None  # type: ignore
+    AsyncCerebras = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+Message = tuple[str, str]  # (role, content)
+Summarizer = Callable[[str, list[Message]], Awaitable[str]]
+
+
+def _speaker(role: str) -> str:
+    return "Candidate" if role == "user" else "Interviewer"
+
+
+class CerebrasSummarizer:
+    """Summarizer that asks Cerebras to fold new exchanges into the running notes.
+
+    Owns its HTTP client; ``RollingContext.aclose`` closes it with the session.
+    """
+
+    def __init__(self, model: str | None = None, max_words: int = 150) -> None:
+        self.client = AsyncCerebras(api_key=os.getenv("CEREBRAS_API_KEY")) if AsyncCerebras is not None else None
+        self.model = model or os.getenv("CEREBRAS_MODEL", "llama3.3-70b")
+        self.max_words = max_words
+
+    async def __call__(self, summary: str, turns: list[Message]) -> str:
+        if self.client is None:
+            raise RuntimeError("Cerebras SDK not available")
+        exchanges = "\n".join(f"{_speaker(role)}: {content}" for role, content in turns)
+        response = await self.client.chat.completions.create(
+            model=self.model,
+            messages=[
+                {"role": "system", "content": "You keep concise running notes of a job interview."},
+                {
+                    "role": "user",
+                    "content": (
+                        f"Notes so far:\n{summary or '(none)'}\n\nNew exchanges:\n{exchanges}\n\n"
+                        f"Rewrite the notes to include the new exchanges in at most {self.max_words} words. "
+                        "Keep which questions were asked, what the candidate said about their experience "
+                        "and skills, and anything worth following up on."
+                    ),
+                },
+            ],
+            max_tokens=self.max_words * 2,
+            temperature=0.2,
+        )
+        return response.choices[0].message.content or ""
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+
+
+class RollingContext:
+    """Chat context for a whole interview that stays roughly constant in size.
+
+    The pinned messages (system prompt, job, resume) and the last
+    ``keep_turns`` messages are kept verbatim. Older messages are folded
+    into a running summary by ``summarize`` on a background task, so the
+    turn that pushes a message out never waits for the LLM; until the fold
+    finishes those messages are still sent verbatim.
+    """
+
+    def __init__(
+        self,
+        pinned: list[Message],
+        *,
+        summarize: Summarizer,
+        keep_turns: int = 6,
+        summary_tokens: int = 300,
+    ) -> None:
+        self.pinned = list(pinned)
+        self.keep_turns = keep_turns
+        self.summary_tokens = summary_tokens
+        self.summary = ""
+        self._summarize = summarize
+        self._recent: list[Message] = []
+        self._pending: list[Message] = []
+        self._task: asyncio.Task | None = None
+        self.turn_tokens: list[int] = []
+
+    @classmethod
+    def from_env(cls, pinned: list[Message]) -> "RollingContext":
+        return cls(
+            pinned,
+            summarize=CerebrasSummarizer(),
+            keep_turns=int(os.getenv("AGENT_CONTEXT_TURNS", "6")),
+            summary_tokens=int(os.getenv("AGENT_SUMMARY_TOKENS", "300")),
+        )
+
+    def add(self, role: str, content: str) -> None:
+        self._recent.append((role, content))
+        overflow = len(self._recent) - self.keep_turns
+        if overflow > 0:
+            self._pending.extend(self._recent[:overflow])
+            del self._recent[:overflow]
+            if self._task is None or self._task.done():
+                self._task = asyncio.create_task(self._fold())
+
+    def _fallback_summary(self, turns: list[Message]) -> str:
+        # Without the LLM keep the most recent text, clipped to the summary budget
+        clipped = " ".join(f"{_speaker(role)}: {truncate_to_tokens(content, 40)}" for role, content in turns)
+        text = f"{self.summary} {clipped}".strip()
+        return text[-self.summary_tokens * CHARS_PER_TOKEN:]
+
+    async def _fold(self) -> None:
+        while self._pending:
+            batch = list(self._pending)
+            try:
+                summary = (await self._summarize(self.summary, batch)).strip()
+            except asyncio.CancelledError:
+                raise
+            except Exception as exc:
+                logger.warning(f"Context summarization failed, clipping instead: {exc}")
+                summary = self._fallback_summary(batch)
+            self.summary = truncate_to_tokens(summary, self.summary_tokens)
+            del self._pending[: len(batch)]
+
+    def messages(self) -> list[Message]:
+        messages = list(self.pinned)
+        if self.summary:
+            messages.append(("system", f"Summary of the interview so far: {self.summary}"))
+        return messages + self._pending + self._recent
+
+    def token_count(self) -> int:
+        return sum(estimate_tokens(content) for _, content in self.messages())
+
+    def chat_ctx(self, instructions: str | None = None) -> Any:
+        """A livekit ``ChatContext`` of the current messages, optionally ending with turn instructions."""
+        ctx = ChatContext()
+        for role, content in self.messages():
+            ctx.add_message(role=role, content=content)
+        if instructions:
+            ctx.add_message(role="system", content=instructions)
+        return ctx
+
+    async def apply(self, agent: Any) -> None:
+        """Push the current context to ``agent`` and record its size for this turn."""
+        tokens = self.token_count()
+        self.turn_tokens.append(tokens)
+        logger.info(
+            f"Turn {len(self.turn_tokens)} context: ~{tokens} tokens "
+            f"({len(self._recent)} recent, {len(self._pending)} awaiting summary, "
+            f"summary ~{estimate_tokens(self.summary)})"
+        )
+        await agent.update_chat_ctx(self.chat_ctx())
+
+    async def aclose(self, *_: Any) -> None:
+        """Room-close hook: stop the background fold and close the summarizer's client."""
+        if self._task is not None and not self._task.done():
+            self._task.cancel()
+            # Let the cancelled request unwind before its client goes away
+            await asyncio.gather(self._task, return_exceptions=True)
+        close = getattr(self._summarize, "aclose", None)
+        if close is not None:
+            await close()
@@ -18,6 +18,14 @@ except Exception:  # pragma: no cover
     silero = None  # type: ignore
     Cerebras = None  # type: ignore
 
+from .context import RollingContext
+from .pipeline import speak_streamed
+from .tracing import TurnTracer
+from .tts_cache import CachedSpeaker, shared_audio_cache
+from .warmup import JobTimer, shared_vad, warm_connections
+
+GREETING = "Hi! I'll be conducting a mock interview with you today. Let me know when you're ready."
+
 
 class Assistant(Agent):  # type: ignore[misc]
     def __init__(self, chat_ctx: "ChatContext") -> None:  # noqa: F821
@@ -37,46 +45,56 @@ async def entrypoint(
     if deepgram is None or openai is None or silero is None:
         raise RuntimeError("LiveKit plugins not available. Ensure dependencies are installed.")
 
+    timer = JobTimer(ctx)
+    stt = deepgram.STT(model="nova-3")
+    llm = openai.LLM.with_cerebras(
+        model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
+        temperature=float(os.getenv("AGENT_TEMPERATURE", "0.7")),
+    )
+    tts_model = os.getenv("DEEPGRAM_TTS_MODEL", "aura-2-thalia-en")
+    tts_voice = os.getenv("DEEPGRAM_TTS_VOICE", "thalia")
+    tts = deepgram.TTS(model=tts_model, voice=tts_voice)
+    # Provider connections warm up while we join the room
+    warm_connections(stt, llm, tts)
+
     await ctx.connect()
+    timer.mark("connected")
 
-    session = AgentSession(
-        vad=silero.VAD.load(),
-        stt=deepgram.STT(model="nova-3"),
-        llm=openai.LLM.with_cerebras(
-            model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
-            temperature=float(os.getenv("AGENT_TEMPERATURE", "0.7")),
-        ),
-        tts=deepgram.TTS(model=os.getenv("DEEPGRAM_TTS_MODEL", "aura-2-thalia-en")),
-    )
+    # VAD is loaded once per process (see warmup.prewarm) and shared by every job
+    session = AgentSession(vad=shared_vad(ctx), stt=stt, llm=llm, tts=tts)
+    tracer = TurnTracer.from_env(session, ctx.room.name)
+    ctx.add_shutdown_callback(tracer.aclose)
 
     today = datetime.now().strftime("%B %d, %Y")
-    chat_ctx = ChatContext()
     jc = job_context or {}
-    chat_ctx.add_message(role="user", content=f"I am interviewing for this job: {jc}.")
-    chat_ctx.add_message(role="user", content=f"This is my resume: {candidate_context}.")
-    chat_ctx.add_message(role="assistant", content=(
-        f"Today's date is {today}. Don't repeat this to the user. This is only for your reference."
-    ))
+    # Job, resume and date stay pinned; only the last few turns are kept verbatim
+    context = RollingContext.from_env([
+        ("user", f"I am interviewing for this job: {jc}."),
+        ("user", f"This is my resume: {candidate_context}."),
+        ("assistant", f"Today's date is {today}. Don't repeat this to the user. This is only for your reference."),
+    ])
+    ctx.add_shutdown_callback(context.aclose)
+    assistant = Assistant(chat_ctx=context.chat_ctx())
 
-    await session.start(agent=Assistant(chat_ctx=chat_ctx), room=ctx.room)
+    await session.start(agent=assistant, room=ctx.room)
+    timer.mark("session_started")
 
-    assistant_msg = await session.generate_reply(
-        instructions=(
-            "In one sentence tell the user you will conduct a mock interview, then pause."
-        )
-    )
-    chat_ctx.add_message(role="assistant", content=assistant_msg)
+    # The greeting never changes, so after the first room its audio comes from the cache
+    speaker = CachedSpeaker(session, tts, shared_audio_cache(ctx), model=tts_model, voice=tts_voice, speed=1.0)
+    await speaker.say(GREETING)
+    context.add("assistant", GREETING)
+    timer.mark("first_greeting")
+    timer.log()
 
     while True:
         user_input = await session.listen()
         if user_input:
-            chat_ctx.add_message(role="user", content=user_input)
-            feedback_msg = await session.generate_reply(
-                instructions=(
-                    "Give a short, informal sentence of feedback without repeating the user's response. Then, pause."
-                )
-            )
-            chat_ctx.add_message(role="assistant", content=feedback_msg)
-            await session.speak(feedback_msg)
+            context.add("user", user_input)
+            await context.apply(assistant)
+            # Spoken sentence by sentence as it streams, and only once
+            feedback = await speak_streamed(session, llm, context.chat_ctx(
+                "Give a short, informal sentence of feedback without repeating the user's response. Then, pause."
+            ), tracer)
+            context.add("assistant", feedback.text)
 
 
@@ -0,0 +1,137 @@
+import logging
+import re
+import time
+from dataclasses import dataclass
+from typing import Any, AsyncGenerator, AsyncIterable, AsyncIterator
+
+from .tracing import TurnTracer
+
+
+logger = logging.getLogger(__name__)
+
+# End of sentence: terminal punctuation, optional closing quote/bracket, then whitespace
+_BOUNDARY_RE = re.compile(r"[.!?]+[\"')\]]*\s+")
+_ABBREVIATIONS = {"mr", "mrs", "ms", "dr", "prof", "sr", "jr", "vs", "etc", "e.g", "i.e", "approx"}
+
+
+def _is_abbreviation(text: str, end: int) -> bool:
+    word = text[:end].rsplit(None, 1)[-1].lower() if text[:end].strip() else ""
+    return word.rstrip(".") in _ABBREVIATIONS
+
+
+async def split_sentences(tokens: AsyncIterable[str], min_chars: int = 12) -> AsyncGenerator[str, None]:
+    """Re-chunk a token stream into sentences, yielding each one as soon as it is complete.
+
+    Fragments shorter than ``min_chars`` ("Yes.") are held back and joined
+    with the next sentence so TTS is not asked for tiny clips.
+    """
+    buffer = ""
+    async for token in tokens:
+        buffer += token
+        start = 0
+        for match in _BOUNDARY_RE.finditer(buffer):
+            if match.end() - start < min_chars or _is_abbreviation(buffer, match.start() + 1):
+                continue
+            yield buffer[start:match.end()].strip()
+            start = match.end()
+        buffer = buffer[start:]
+    if buffer.strip():
+        yield buffer.strip()
+
+
+@dataclass
+class SpokenReply:
+    text: str
+    interrupted: bool
+    first_sentence_seconds: float | None
+    first_audio_seconds: float | None
+
+
+async def speak_streamed(
+    session: Any, llm: Any, chat_ctx: Any, tracer: TurnTracer | None = None
+) -> SpokenReply:
+    """Generate a reply with ``llm`` and speak it sentence by sentence while it is being generated.
+
+    See ``speak_tokens``; on barge-in the ``llm.chat`` stream is exited, so
+    the provider stops generating.
+    """
+
+    async def tokens() -> AsyncGenerator[str, None]:
+        async with llm.chat(chat_ctx=chat_ctx) as stream:
+            async for chunk in stream:
+                if chunk.delta is not None and chunk.delta.content:
+                    yield chunk.delta.content
+
+    return await speak_tokens(session, tokens(), tracer)
+
+
+async def speak_tokens(
+    session: Any, tokens: AsyncGenerator[str, None], tracer: TurnTracer | None = None
+) -> SpokenReply:
+    """Speak a token stream sentence by sentence while it is still arriving.
+
+    Each finished sentence goes to ``session.say`` right away, so synthesis
+    and playback of the first sentence overlap with generating the rest.
+    If the candidate barges in, the session interrupts playback, stops
+    pulling text and ``tokens`` is closed here; ``text`` then holds only
+    what had been pulled. ``tracer`` gets the LLM first token, first
+    sentence and LLM done marks of the turn.
+    """
+    started = time.perf_counter()
+    generated: list[str] = []
+    marks: dict[str, float] = {}
+
+    def trace(name: str) -> None:
+        if tracer is not None:
+            tracer.mark(name)
+
+    async def traced(chunks: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+        async for chunk in chunks:
+            if not generated:
+                trace("llm_first_token")
+            generated.append(chunk)
+            yield chunk
+        trace("llm_done")
+
+    async def sentences(chunks: AsyncIterator[str]) -> AsyncGenerator[str, None]:
+        async for sentence in chunks:
+            if "first_sentence" not in marks:
+                marks["first_sentence"] = time.perf_counter() - started
+                trace("first_sentence")
+            yield sentence + " "
+
+    def on_state(event: Any) -> None:
+        if getattr(event, "new_state", None) == "speaking":
+            marks.setdefault("first_audio", time.perf_counter() - started)
+
+    token_stream = traced(tokens)
+    sentence_stream = split_sentences(token_stream)
+    text_stream = sentences(sentence_stream)
+    session.on("agent_state_changed", on_state)
+    try:
+        # The reply is recorded by the caller's own context, not the framework's
+        handle = session.say(text_stream, allow_interruptions=True, add_to_chat_ctx=False)
+        await handle
+    finally:
+        session.off("agent_state_changed", on_state)
+        # After a barge-in nothing pulls these again; closing them outermost first
+        # reaches ``tokens`` so its producer stops. No-op once exhausted.
+        for stream in (text_stream, sentence_stream, token_stream, tokens):
+            await stream.aclose()
+
+    reply = SpokenReply(
+        text="".join(generated).strip(),
+        interrupted=bool(getattr(handle, "interrupted", False)),
+        first_sentence_seconds=marks.get("first_sentence"),
+        first_audio_seconds=marks.get("first_audio"),
+    )
+    logger.info(
+        f"Reply spoken: first sentence {_ms(reply.first_sentence_seconds)}, "
+        f"first audio {_ms(reply.first_audio_seconds)}, total {_ms(time.perf_counter() - started)}"
+        + (", interrupted" if reply.interrupted else "")
+    )
+    return reply
+
+
+def _ms(seconds: float | None) -> str:
+    return f"{seconds * 1000:.0f}ms" if seconds is not None else "n/a"
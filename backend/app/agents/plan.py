@@ -0,0 +1,202 @@
+import asyncio
+import json
+import logging
+import os
+import re
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..services.cache import TieredCache, content_key
+
+# Lazy import heavy deps so the API can start without them installed locally
+try:
+    from livekit.agents import ChatContext  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    ChatContext = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the prompt or the plan format changes so cached plans are regenerated
+PLAN_VERSION = "1"
+
+# Interview phases in order, with how many candidate turns each one lasts
+PHASES = (("introduction", 2), ("experience", 3), ("deep_dive", 2), ("wrap_up", 1))
+
+# What to do in a phase once its planned questions are used up (or without a plan)
+PHASE_GUIDANCE = {
+    "introduction": """
+        Ask follow-up questions about their background, education, or previous experience.
+        Show interest in their journey. Keep responses encouraging and brief.
+        """,
+    "experience": """
+        Ask about specific technical skills, projects, or achievements mentioned in their resume.
+        Use the STAR method (Situation, Task, Action, Result) for behavioral questions.
+        Keep responses concise and engaging.
+        """,
+    "deep_dive": """
+        Ask about challenges they've faced, how they handle teamwork, or their career goals.
+        Show genuine interest in their problem-solving abilities.
+        Keep responses brief and encouraging.
+        """,
+    "wrap_up": """
+        Ask if they have any questions about the role or company.
+        Thank them for their time and provide next steps.
+        Keep responses brief and professional.
+        """,
+}
+
+_PLAN_PROMPT = """You are preparing a job interview. Write the questions the interviewer will ask, in order.
+
+Job: {job}
+
+Candidate resume: {resume}
+
+Return only a JSON object with these keys, each a list of short spoken questions:
+{shape}
+Base the experience and deep_dive questions on specific items from the resume and the job requirements.
+Use the STAR method for behavioral questions. One sentence per question."""
+
+_FENCE_RE = re.compile(r"^```(?:json)?\s*|\s*```$")
+
+
+def phase_for(turn: int) -> tuple[str, int]:
+    """Phase of the ``turn``-th candidate answer (1-based) and the index of the turn within it."""
+    start = 1
+    for phase, turns in PHASES:
+        if turn < start + turns:
+            return phase, turn - start
+        start += turns
+    return PHASES[-1][0], turn - start + PHASES[-1][1]
+
+
+@dataclass
+class InterviewPlan:
+    """Ordered question bank per phase, generated once per job and resume."""
+
+    questions: dict[str, list[str]] = field(default_factory=dict)
+    cached: bool = False
+
+    @classmethod
+    def parse(cls, text: str) -> "InterviewPlan":
+        data = json.loads(_FENCE_RE.sub("", text.strip()))
+        questions = {}
+        for phase, _ in PHASES:
+            items = data.get(phase) or []
+            if not isinstance(items, list):
+                raise ValueError(f"Plan phase {phase!r} is not a list")
+            questions[phase] = [str(item).strip() for item in items if str(item).strip()]
+        if not any(questions.values()):
+            raise ValueError("Plan has no questions")
+        return cls(questions=questions)
+
+    def to_json(self) -> str:
+        return json.dumps(self.questions)
+
+    def instructions(self, turn: int) -> str:
+        """Short per-turn prompt: the planned question for ``turn``, or the phase guidance."""
+        phase, index = phase_for(turn)
+        bank = self.questions.get(phase, [])
+        if index < len(bank):
+            return (
+                "React to the candidate's answer in a few words, then ask this next question "
+                f"in your own words: {bank[index]} Two sentences at most."
+            )
+        return PHASE_GUIDANCE[phase]
+
+
+def default_instructions(turn: int) -> str:
+    """Per-turn prompt when no plan is available, as before plans existed."""
+    return PHASE_GUIDANCE[phase_for(turn)[0]]
+
+
+class PlanCache:
+    """Interview plans keyed by a hash of the job, resume and planning model."""
+
+    def __init__(self, cache: TieredCache) -> None:
+        self._cache = cache
+
+    @classmethod
+    def from_env(cls) -> "PlanCache":
+        default_dir = os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "plans")
+        directory = os.getenv("AGENT_PLAN_CACHE_DIR", default_dir) or None
+        return cls(
+            TieredCache(
+                directory,
+                max_memory_bytes=4 * 1024 * 1024,
+                max_disk_bytes=int(os.getenv("AGENT_PLAN_CACHE_DISK_BYTES", str(64 * 1024 * 1024))),
+                suffix=".json",
+            )
+        )
+
+    @staticmethod
+    def key(job: dict[str, Any], resume: str, model: str) -> str:
+        return content_key(PLAN_VERSION, model, json.dumps(job, sort_keys=True, default=str), resume)
+
+    def get(self, key: str) -> InterviewPlan | None:
+        value = self._cache.get(key)
+        if value is None:
+            return None
+        questions = json.loads(value)
+        if not isinstance(questions, dict):
+            raise ValueError("Cached plan is not a JSON object")
+        return InterviewPlan(questions=questions, cached=True)
+
+    def put(self, key: str, plan: InterviewPlan) -> None:
+        self._cache.put(key, plan.to_json().encode("utf-8"))
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+
+def shared_plan_cache(ctx: Any) -> PlanCache:
+    """The process-wide plan cache, so every job in the worker process reuses it."""
+    cache = ctx.proc.userdata.get("plan_cache")
+    if cache is None:
+        cache = PlanCache.from_env()
+        ctx.proc.userdata["plan_cache"] = cache
+    return cache
+
+
+async def _generate(llm: Any, job: dict[str, Any], resume: str) -> InterviewPlan:
+    shape = json.dumps({phase: [f"... {turns} questions ..."] for phase, turns in PHASES})
+    chat_ctx = ChatContext()
+    chat_ctx.add_message(role="user", content=_PLAN_PROMPT.format(job=json.dumps(job), resume=resume, shape=shape))
+    parts: list[str] = []
+    async with llm.chat(chat_ctx=chat_ctx) as stream:
+        async for chunk in stream:
+            if chunk.delta is not None and chunk.delta.content:
+                parts.append(chunk.delta.content)
+    return InterviewPlan.parse("".join(parts))
+
+
+async def load_plan(
+    cache: PlanCache, llm: Any, job: dict[str, Any], resume: str, model: str
+) -> InterviewPlan | None:
+    """The cached plan for this job and resume, generating and caching it with ``llm`` on a miss.
+
+    Returns ``None`` if generation fails; the interview then falls back to
+    the phase guidance.
+    """
+    started = time.perf_counter()
+    loop = asyncio.get_running_loop()
+    key = PlanCache.key(job, resume, model)
+    try:
+        plan = await loop.run_in_executor(None, cache.get, key)
+    except (ValueError, TypeError) as exc:
+        # A truncated or foreign cache file is a miss; the fresh plan overwrites it
+        logger.warning(f"Ignoring unreadable cached interview plan: {exc}")
+        plan = None
+    if plan is None:
+        try:
+            plan = await _generate(llm, job, resume)
+        except Exception as exc:
+            logger.warning(f"Interview plan generation failed, using phase guidance: {exc}")
+            return None
+        await loop.run_in_executor(None, cache.put, key, plan)
+    logger.info(
+        f"Interview plan {'cached' if plan.cached else 'generated'} in {(time.perf_counter() - started) * 1000:.0f}ms: "
+        + ", ".join(f"{phase}={len(questions)}" for phase, questions in plan.questions.items())
+    )
+    return plan
@@ -0,0 +1,224 @@
+import asyncio
+import difflib
+import logging
+import os
+import re
+import time
+from typing import Any, AsyncGenerator
+
+from .context import RollingContext
+
+
+logger = logging.getLogger(__name__)
+
+_WORD_RE = re.compile(r"[a-z0-9']+")
+
+
+def transcript_similarity(a: str, b: str) -> float:
+    """Word-level similarity in [0, 1], ignoring case and punctuation."""
+    words_a = _WORD_RE.findall(a.lower())
+    words_b = _WORD_RE.findall(b.lower())
+    if not words_a and not words_b:
+        return 1.0
+    return difflib.SequenceMatcher(None, words_a, words_b, autojunk=False).ratio()
+
+
+class _Draft:
+    """One speculative generation, kept chunk by chunk as it arrives.
+
+    A taken draft replays what is already there and then follows the live
+    stream, so speaking it is pipelined just like a fresh reply.
+    """
+
+    def __init__(self, llm: Any, chat_ctx: Any) -> None:
+        self.chunks: list[str] = []
+        self.seconds: float | None = None
+        self._started = time.perf_counter()
+        self._more = asyncio.Event()
+        self.task = asyncio.create_task(self._run(llm, chat_ctx))
+        self.task.add_done_callback(self._on_done)
+
+    async def _run(self, llm: Any, chat_ctx: Any) -> None:
+        try:
+            async with llm.chat(chat_ctx=chat_ctx) as stream:
+                async for chunk in stream:
+                    if chunk.delta is not None and chunk.delta.content:
+                        self.chunks.append(chunk.delta.content)
+                        self._more.set()
+            self.seconds = time.perf_counter() - self._started
+        finally:
+            self._more.set()
+
+    def _on_done(self, task: asyncio.Task) -> None:
+        if not task.cancelled() and task.exception() is not None:
+            logger.warning(f"Speculative draft failed: {task.exception()}")
+
+    async def _wait(self) -> None:
+        self._more.clear()
+        await self._more.wait()
+
+    async def started(self) -> bool:
+        """Wait for the first chunk; ``False`` if the draft ended without one."""
+        while not self.chunks and not self.task.done():
+            await self._wait()
+        return bool(self.chunks)
+
+    async def tokens(self) -> AsyncGenerator[str, None]:
+        index = 0
+        try:
+            while True:
+                if index < len(self.chunks):
+                    index += 1
+                    yield self.chunks[index - 1]
+                elif self.task.done():
+                    return
+                else:
+                    await self._wait()
+        finally:
+            # Closed early on barge-in: stop the provider stream
+            self.task.cancel()
+
+    def cancel(self) -> None:
+        self.task.cancel()
+
+
+class SpeculativeReplier:
+    """Drafts the next reply from interim STT results while the candidate is still talking.
+
+    Once the interim hypothesis has been stable for ``stable_seconds`` a
+    draft is generated with the session's LLM (text only, nothing is
+    spoken). A later hypothesis that drifts below ``threshold`` similarity
+    cancels the draft, and a new one starts when speech settles again. When
+    the final transcript arrives, ``take`` returns the draft's token stream
+    if it was based on a close enough hypothesis (it may still be
+    generating), otherwise ``None`` and the caller generates normally.
+    """
+
+    def __init__(
+        self,
+        session: Any,
+        llm: Any,
+        context: RollingContext,
+        *,
+        threshold: float = 0.9,
+        stable_seconds: float = 0.3,
+    ) -> None:
+        self.llm = llm
+        self.context = context
+        self.threshold = threshold
+        self.stable_seconds = stable_seconds
+        self.instructions = ""
+        self._finals: list[str] = []
+        self._interim = ""
+        self._timer: asyncio.TimerHandle | None = None
+        self._draft: _Draft | None = None
+        self._draft_basis = ""
+        self._draft_started = 0.0
+        self.turns = 0
+        self.hits = 0
+        self.misses = 0
+        self.seconds_saved = 0.0
+        session.on("user_input_transcribed", self._on_transcript)
+
+    @classmethod
+    def from_env(cls, session: Any, llm: Any, context: RollingContext) -> "SpeculativeReplier | None":
+        if os.getenv("AGENT_SPECULATION", "1") != "1":
+            return None
+        return cls(
+            session,
+            llm,
+            context,
+            threshold=float(os.getenv("AGENT_SPECULATION_THRESHOLD", "0.9")),
+            stable_seconds=float(os.getenv("AGENT_SPECULATION_STABLE_MS", "300")) / 1000,
+        )
+
+    @property
+    def hypothesis(self) -> str:
+        return " ".join(part for part in (*self._finals, self._interim) if part)
+
+    def _on_transcript(self, event: Any) -> None:
+        if event.is_final:
+            self._finals.append(event.transcript.strip())
+            self._interim = ""
+        else:
+            self._interim = event.transcript.strip()
+        if self._draft is not None and transcript_similarity(self._draft_basis, self.hypothesis) < self.threshold:
+            self._cancel_draft()
+        if self._timer is not None:
+            self._timer.cancel()
+        self._timer = asyncio.get_running_loop().call_later(self.stable_seconds, self._on_stable)
+
+    def _on_stable(self) -> None:
+        self._timer = None
+        basis = self.hypothesis
+        if basis and self._draft is None:
+            self._draft_basis = basis
+            self._draft_started = time.perf_counter()
+            chat_ctx = self.context.chat_ctx()
+            chat_ctx.add_message(role="user", content=basis)
+            if self.instructions:
+                chat_ctx.add_message(role="system", content=self.instructions)
+            self._draft = _Draft(self.llm, chat_ctx)
+
+    def _cancel_draft(self) -> None:
+        if self._draft is not None:
+            self._draft.cancel()
+        self._draft = None
+        self._draft_basis = ""
+
+    def _reset(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        self._cancel_draft()
+        self._finals.clear()
+        self._interim = ""
+
+    async def take(self, final_transcript: str) -> AsyncGenerator[str, None] | None:
+        """The drafted reply's token stream if it still fits ``final_transcript``.
+
+        Speak it with ``speak_tokens`` so it is pipelined like a fresh reply;
+        closing the stream early cancels the draft.
+        """
+        self.turns += 1
+        draft, basis = self._draft, self._draft_basis
+        head_start = time.perf_counter() - self._draft_started
+        self._draft = None
+        self._reset()
+
+        hit = False
+        similarity = transcript_similarity(basis, final_transcript) if draft is not None else 0.0
+        if draft is not None and similarity >= self.threshold:
+            # A draft that failed or produced nothing is a miss; the caller generates normally
+            hit = await draft.started()
+        elif draft is not None:
+            draft.cancel()
+
+        if hit:
+            self.hits += 1
+            # LLM time that no longer sits after end of speech
+            saved = min(head_start, draft.seconds or head_start)
+            self.seconds_saved += saved
+            logger.info(
+                f"Speculation turn {self.turns}: hit (similarity {similarity:.2f}), saved {saved * 1000:.0f}ms, "
+                f"hit rate {self.hits / self.turns:.0%}"
+            )
+            return draft.tokens()
+        outcome = "no draft"
+        if draft is not None:
+            self.misses += 1
+            outcome = "miss"
+        logger.info(f"Speculation turn {self.turns}: {outcome}, hit rate {self.hits / self.turns:.0%}")
+        return None
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "turns": self.turns,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": round(self.hits / self.turns, 3) if self.turns else 0.0,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
+
+    def close(self) -> None:
+        self._reset()
@@ -0,0 +1,163 @@
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field
+from typing import Any
+
+from ..services.sketch import QuantileSketch
+
+
+logger = logging.getLogger(__name__)
+
+# (stage, from mark, to mark); durations are recorded in milliseconds
+STAGES = (
+    ("stt", "end_of_speech", "stt_final"),
+    ("llm_first_token", "stt_final", "llm_first_token"),
+    ("llm", "llm_first_token", "llm_done"),
+    ("tts_first_byte", "first_sentence", "tts_first_byte"),
+    ("playback", "tts_first_byte", "playback_start"),
+    ("turn", "end_of_speech", "playback_start"),
+)
+PERCENTILES = (0.5, 0.9, 0.99)
+
+# Every session in this worker process is folded in here when it closes
+_worker_stages: dict[str, QuantileSketch] = {}
+
+
+@dataclass
+class Turn:
+    index: int
+    marks: dict[str, float] = field(default_factory=dict)
+    tags: dict[str, Any] = field(default_factory=dict)
+
+    def spans(self) -> dict[str, float]:
+        return {
+            stage: (self.marks[end] - self.marks[start]) * 1000
+            for stage, start, end in STAGES
+            if start in self.marks and end in self.marks
+        }
+
+
+def _percentiles(sketches: dict[str, QuantileSketch]) -> dict[str, dict[str, float | None]]:
+    summary = {}
+    for stage, sketch in sketches.items():
+        summary[stage] = {f"p{round(q * 100)}": _round(sketch.quantile(q)) for q in PERCENTILES}
+        summary[stage]["count"] = sketch.count
+    return summary
+
+
+def _round(value: float | None) -> float | None:
+    return round(value, 1) if value is not None else None
+
+
+class TurnTracer:
+    """Per-turn latency spans for one agent session.
+
+    Marks end of speech, final transcript and start of playback from session
+    events and TTS first byte from the TTS metrics; ``speak_tokens`` marks
+    LLM first token, first sentence and LLM done. A turn is closed when the
+    agent stops speaking: its spans go into per-stage sketches and, if
+    ``path`` is set, one JSON line per turn is appended there. ``aclose``
+    writes the session summary (percentiles plus the mergeable sketches).
+    """
+
+    def __init__(self, session: Any, room: str, *, path: str | None = None) -> None:
+        self.room = room
+        self.path = path
+        self.turns = 0
+        self.stages: dict[str, QuantileSketch] = {}
+        self._turn: Turn | None = None
+        self._started = time.time()
+        session.on("user_state_changed", self._on_user_state)
+        session.on("user_input_transcribed", self._on_transcript)
+        session.on("agent_state_changed", self._on_agent_state)
+        session.on("metrics_collected", self._on_metrics)
+
+    @classmethod
+    def from_env(cls, session: Any, room: str) -> "TurnTracer":
+        return cls(session, room, path=os.getenv("AGENT_TRACE_PATH") or None)
+
+    def _current(self) -> Turn:
+        if self._turn is None:
+            self._turn = Turn(index=self.turns)
+        return self._turn
+
+    def mark(self, name: str, at: float | None = None) -> None:
+        """Record ``name`` for the current turn; the first occurrence wins."""
+        self._current().marks.setdefault(name, time.perf_counter() if at is None else at)
+
+    def tag(self, key: str, value: Any) -> None:
+        self._current().tags[key] = value
+
+    def _on_user_state(self, event: Any) -> None:
+        if event.new_state == "speaking" and self._turn is not None and "playback_start" in self._turn.marks:
+            # Barge-in: the candidate's next turn starts before the agent has stopped
+            self._finish()
+        elif event.old_state == "speaking" and event.new_state == "listening":
+            # The reply answers the last utterance, so a pause mid-answer moves the mark
+            self._current().marks["end_of_speech"] = time.perf_counter()
+
+    def _on_transcript(self, event: Any) -> None:
+        if event.is_final:
+            self._current().marks["stt_final"] = time.perf_counter()
+
+    def _on_agent_state(self, event: Any) -> None:
+        if event.new_state == "speaking":
+            self.mark("playback_start")
+        elif event.old_state == "speaking" and self._turn is not None and "playback_start" in self._turn.marks:
+            self._finish()
+
+    def _on_metrics(self, event: Any) -> None:
+        metrics = getattr(event, "metrics", None)
+        if getattr(metrics, "type", None) == "tts_metrics" and metrics.ttfb >= 0:
+            # Reported when the request completes; step back to when its first byte arrived
+            self.mark("tts_first_byte", at=time.perf_counter() - metrics.duration + metrics.ttfb)
+
+    def _finish(self) -> None:
+        turn, self._turn = self._turn, None
+        self.turns += 1
+        spans = turn.spans()
+        for stage, ms in spans.items():
+            self.stages.setdefault(stage, QuantileSketch()).add(ms)
+        logger.info(
+            f"Turn {turn.index} latency (ms): "
+            + ", ".join(f"{stage}={ms:.0f}" for stage, ms in spans.items())
+        )
+        self._write({
+            "kind": "turn",
+            "room": self.room,
+            "turn": turn.index,
+            "spans_ms": {stage: round(ms, 1) for stage, ms in spans.items()},
+            **turn.tags,
+        })
+
+    def _write(self, record: dict[str, Any]) -> None:
+        if not self.path:
+            return
+        try:
+            with open(self.path, "a", encoding="utf-8") as fh:
+                fh.write(json.dumps(record) + "\n")
+        except OSError as exc:
+            logger.warning(f"Could not write latency trace to {self.path}: {exc}")
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "kind": "session",
+            "room": self.room,
+            "turns": self.turns,
+            "duration_seconds": round(time.time() - self._started, 1),
+            "percentiles_ms": _percentiles(self.stages),
+            "sketches": {stage: sketch.to_json() for stage, sketch in self.stages.items()},
+        }
+
+    async def aclose(self, *_: Any) -> None:
+        """Room-close hook: flush the open turn and write the session summary."""
+        if self._turn is not None and self._turn.marks:
+            self._finish()
+        summary = self.summary()
+        self._write(summary)
+        for stage, sketch in self.stages.items():
+            _worker_stages.setdefault(stage, QuantileSketch()).merge(sketch)
+        logger.info(f"Session latency room={self.room}: {json.dumps(summary['percentiles_ms'])}")
+        logger.info(f"Worker latency so far: {json.dumps(_percentiles(_worker_stages))}")
@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import os
+import re
+import struct
+import time
+from typing import Any, AsyncIterator
+
+from ..services.cache import TieredCache, content_key
+
+# Lazy import heavy deps so the API can start without them installed locally
+try:
+    from livekit import rtc  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    rtc = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+# Bump when the stored layout changes so old entries are ignored
+AUDIO_CACHE_VERSION = "1"
+
+# Stored value: sample rate and channel count, then 16-bit PCM
+_HEADER = struct.Struct("<II")
+_FRAME_SECONDS = 0.1
+_SPACE_RE = re.compile(r"\s+")
+
+
+def normalize_utterance(text: str) -> str:
+    """Cache form of ``text``: case and whitespace differences do not change the audio."""
+    return _SPACE_RE.sub(" ", text).strip().lower()
+
+
+class AudioCache:
+    """Synthesized speech keyed by normalized text, TTS model, voice and speed."""
+
+    def __init__(self, cache: TieredCache) -> None:
+        self._cache = cache
+
+    @classmethod
+    def from_env(cls) -> "AudioCache":
+        default_dir = os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "tts")
+        directory = os.getenv("TTS_CACHE_DIR", default_dir) or None
+        return cls(
+            TieredCache(
+                directory,
+                max_memory_bytes=int(os.getenv("TTS_CACHE_MEMORY_BYTES", str(16 * 1024 * 1024))),
+                max_disk_bytes=int(os.getenv("TTS_CACHE_DISK_BYTES", str(256 * 1024 * 1024))),
+                suffix=".pcm",
+            )
+        )
+
+    @staticmethod
+    def key(text: str, model: str, voice: str, speed: float) -> str:
+        return content_key(AUDIO_CACHE_VERSION, normalize_utterance(text), model, voice, repr(float(speed)))
+
+    def get(self, key: str) -> tuple[int, int, bytes] | None:
+        value = self._cache.get(key)
+        if value is None or len(value) < _HEADER.size:
+            return None
+        sample_rate, num_channels = _HEADER.unpack_from(value)
+        return sample_rate, num_channels, value[_HEADER.size:]
+
+    def put(self, key: str, sample_rate: int, num_channels: int, pcm: bytes) -> None:
+        self._cache.put(key, _HEADER.pack(sample_rate, num_channels) + pcm)
+
+    def stats(self) -> dict[str, Any]:
+        return self._cache.stats()
+
+
+def shared_audio_cache(ctx: Any) -> AudioCache:
+    """The process-wide audio cache, so every job in the worker process reuses it."""
+    cache = ctx.proc.userdata.get("audio_cache")
+    if cache is None:
+        cache = AudioCache.from_env()
+        ctx.proc.userdata["audio_cache"] = cache
+    return cache
+
+
+class CachedSpeaker:
+    """Speaks fixed utterances from the audio cache, synthesizing with ``tts`` only on a miss.
+
+    A hit is handed to ``session.say`` as ready audio, so it starts playing
+    without a provider round trip. A miss streams the plugin's audio to the
+    session as it arrives and stores it once synthesis completes (not when
+    the candidate interrupted it).
+    """
+
+    def __init__(self, session: Any, tts: Any, cache: AudioCache, *, model: str, voice: str, speed: float) -> None:
+        self.session = session
+        self.tts = tts
+        self.cache = cache
+        self.model = model
+        self.voice = voice
+        self.speed = speed
+
+    async def say(self, text: str) -> Any:
+        started = time.perf_counter()
+        key = AudioCache.key(text, self.model, self.voice, self.speed)
+        loop = asyncio.get_running_loop()
+        cached = await loop.run_in_executor(None, self.cache.get, key)
+        audio = self._replay(*cached) if cached is not None else self._synthesize(key, text)
+        handle = self.session.say(text, audio=audio, allow_interruptions=True, add_to_chat_ctx=False)
+        logger.info(
+            f"Fixed utterance {'from cache' if cached is not None else 'synthesized'} "
+            f"(lookup {(time.perf_counter() - started) * 1000:.0f}ms): {text[:40]}"
+        )
+        return await handle
+
+    async def _replay(self, sample_rate: int, num_channels: int, pcm: bytes) -> AsyncIterator[Any]:
+        bytes_per_frame = int(sample_rate * _FRAME_SECONDS) * num_channels * 2
+        for offset in range(0, len(pcm), bytes_per_frame):
+            data = pcm[offset:offset + bytes_per_frame]
+            yield rtc.AudioFrame(
+                data=data,
+                sample_rate=sample_rate,
+                num_channels=num_channels,
+                samples_per_channel=len(data) // (2 * num_channels),
+            )
+
+    async def _synthesize(self, key: str, text: str) -> AsyncIterator[Any]:
+        chunks: list[bytes] = []
+        sample_rate = num_channels = 0
+        async with self.tts.synthesize(text) as stream:
+            async for event in stream:
+                frame = event.frame
+                sample_rate, num_channels = frame.sample_rate, frame.num_channels
+                chunks.append(bytes(frame.data))
+                yield frame
+        if chunks:
+            loop = asyncio.get_running_loop()
+            await loop.run_in_executor(None, self.cache.put, key, sample_rate, num_channels, b"".join(chunks))
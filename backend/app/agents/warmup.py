@@ -0,0 +1,69 @@
+import json
+import logging
+import time
+from typing import Any
+
+# Lazy import heavy deps so the API can start without them installed locally
+try:
+    from livekit.plugins import silero  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    silero = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+def prewarm(proc: Any) -> None:
+    """``WorkerOptions(prewarm_fnc=...)`` hook, run once per job process before it accepts jobs.
+
+    Loads the Silero VAD model into ``proc.userdata`` so every job in the
+    process shares it (it is only read, each session opens its own stream).
+    Provider connections are per job; see ``warm_connections``.
+    """
+    started = time.perf_counter()
+    if silero is not None:
+        proc.userdata["vad"] = silero.VAD.load()
+    proc.userdata["prewarm_seconds"] = time.perf_counter() - started
+    logger.info(f"Process prewarmed in {proc.userdata['prewarm_seconds']:.2f}s")
+
+
+def shared_vad(ctx: Any) -> Any:
+    """The process-wide VAD, loading it here if the worker was started without ``prewarm``."""
+    vad = ctx.proc.userdata.get("vad")
+    if vad is None:
+        vad = silero.VAD.load()
+        ctx.proc.userdata["vad"] = vad
+    return vad
+
+
+def warm_connections(*components: Any) -> None:
+    """Start the STT/LLM/TTS plugins connecting to their providers in the background.
+
+    Called before ``ctx.connect()`` so TLS and WebSocket setup overlaps with
+    joining the room instead of delaying the first greeting.
+    """
+    for component in components:
+        prewarm_fnc = getattr(component, "prewarm", None)
+        if prewarm_fnc is None:
+            continue
+        try:
+            prewarm_fnc()
+        except Exception as exc:
+            logger.warning(f"Failed to prewarm {type(component).__name__}: {exc}")
+
+
+class JobTimer:
+    """Milestones of one job since it was accepted, logged as a single line."""
+
+    def __init__(self, ctx: Any) -> None:
+        self.room = ctx.room.name
+        self.prewarmed = "vad" in ctx.proc.userdata
+        self.started = time.perf_counter()
+        self.marks: dict[str, float] = {}
+
+    def mark(self, name: str) -> None:
+        self.marks[name] = time.perf_counter() - self.started
+
+    def log(self) -> None:
+        timings = {name: round(seconds * 1000) for name, seconds in self.marks.items()}
+        logger.info(f"Job timings (ms) room={self.room} prewarmed={self.prewarmed}: {json.dumps(timings)}")
@@ -1,14 +1,51 @@
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from .deps import include_routers
+from .services.fetch import Fetcher
+from .services.llm import LLMGateway
+from .services.memo import AsyncMemo
+from .services.metrics import MetricsEngine
+from .services.page_cache import PageCache
+from .services.pdf import PdfExtractor, ResumeCache
+from .services.sessions import SessionStore
 from dotenv import load_dotenv
 import os
 
 
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Shared resources live for the whole process and are reused across requests
+    app.state.fetcher = Fetcher.from_env()
+    app.state.page_cache = PageCache.from_env(app.state.fetcher)
+    app.state.resume_cache = ResumeCache.from_env()
+    app.state.pdf_extractor = PdfExtractor.from_env()
+    app.state.llm = LLMGateway.from_env()
+    app.state.job_cache = AsyncMemo(
+        ttl=float(os.getenv("LLM_CACHE_TTL_SECONDS", "3600")),
+        max_entries=int(os.getenv("LLM_CACHE_MAX_ENTRIES", "1024")),
+    )
+    app.state.metrics_engine = MetricsEngine.from_env()
+    app.state.feedback_cache = AsyncMemo(
+        ttl=float(os.getenv("FEEDBACK_CACHE_TTL_SECONDS", "86400")),
+        max_entries=int(os.getenv("FEEDBACK_CACHE_MAX_ENTRIES", "4096")),
+    )
+    app.state.session_store = SessionStore.from_env()
+    try:
+        yield
+    finally:
+        await app.state.page_cache.aclose()
+        await app.state.fetcher.aclose()
+        await app.state.llm.aclose()
+        app.state.pdf_extractor.shutdown()
+        await app.state.session_store.aclose()
+
+
 def create_app() -> FastAPI:
     # Load .env if present
     load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), "..", ".env"))
-    app = FastAPI(title="Voice Interviewer API", version="0.1.0")
+    app = FastAPI(title="Voice Interviewer API", version="0.1.0", lifespan=lifespan)
 
     app.add_middleware(
         CORSMiddleware,
@@ -22,11 +59,13 @@ def create_app() -> FastAPI:
     async def health_check():
         return {"status": "ok"}
 
+    @app.get("/metrics/llm")
+    async def llm_metrics():
+        return app.state.llm.metrics()
+
     include_routers(app)
 
     return app
 
 
 app = create_app()
-
-
@@ -1,9 +1,16 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any, Optional
-from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
+from typing import List, Dict, Any, Literal, Optional
+from datetime import date, datetime, timedelta
+import base64
+import binascii
 import json
 
+from ..services.export import EXTENSIONS, MEDIA_TYPES, columnar_available, default_format, export_sessions
+from ..services.sessions import SessionCursor, SessionFilter, SessionStore, get_session_store
+from ..services.trends import SessionRollup, bucket_start
+
 router = APIRouter(prefix="/analytics", tags=["analytics"])
 
 
@@ -19,6 +26,13 @@ class InterviewSession(BaseModel):
     feedback: Optional[Dict[str, Any]] = None
 
 
+class SessionPage(BaseModel):
+    items: List[InterviewSession] = Field(
+        description="Sessions oldest first; with `fields`, only those keys"
+    )
+    next_cursor: Optional[str] = Field(None, description="Pass back as `cursor` for the next page; null on the last")
+
+
 class SessionAnalytics(BaseModel):
     total_sessions: int
     average_duration: float
@@ -27,12 +41,8 @@ class SessionAnalytics(BaseModel):
     improvement_trends: List[Dict[str, Any]]
 
 
-# In-memory storage (replace with database in production)
-interview_sessions: Dict[str, InterviewSession] = {}
-
-
 @router.post("/session/start")
-async def start_session(session_data: Dict[str, Any]):
+async def start_session(session_data: Dict[str, Any], store: SessionStore = Depends(get_session_store)):
     """Start tracking an interview session."""
     session_id = session_data.get("session_id", f"session_{datetime.now().timestamp()}")
     
@@ -42,41 +52,151 @@ async def start_session(session_data: Dict[str, Any]):
         start_time=datetime.now()
     )
     
-    interview_sessions[session_id] = session
+    await store.put(session.model_dump())
     return {"session_id": session_id, "status": "started"}
 
 
+def _overall_score(value: Any) -> Optional[int]:
+    # The trends histogram buckets by integer score, so 7.5 or "8" would corrupt it
+    if value is None:
+        return None
+    if isinstance(value, bool) or not isinstance(value, int) or not 1 <= value <= 10:
+        raise HTTPException(status_code=422, detail="overall_score must be an integer from 1 to 10")
+    return value
+
+
+def _counter(session_data: Dict[str, Any], name: str) -> int:
+    # Assignment is not validated by the model, and the export schema is int64
+    value = session_data.get(name, 0)
+    if isinstance(value, bool) or not isinstance(value, int) or value < 0:
+        raise HTTPException(status_code=422, detail=f"{name} must be a non-negative integer")
+    return value
+
+
 @router.post("/session/end")
-async def end_session(session_data: Dict[str, Any]):
+async def end_session(session_data: Dict[str, Any], store: SessionStore = Depends(get_session_store)):
     """End tracking an interview session."""
     session_id = session_data.get("session_id")
-    if not session_id or session_id not in interview_sessions:
+    record = await store.get(session_id) if session_id else None
+    if record is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    session = interview_sessions[session_id]
+    session = InterviewSession(**record)
     session.end_time = datetime.now()
     session.duration_minutes = int((session.end_time - session.start_time).total_seconds() / 60)
-    session.questions_asked = session_data.get("questions_asked", 0)
-    session.candidate_responses = session_data.get("candidate_responses", 0)
-    session.overall_score = session_data.get("overall_score")
+    session.questions_asked = _counter(session_data, "questions_asked")
+    session.candidate_responses = _counter(session_data, "candidate_responses")
+    session.overall_score = _overall_score(session_data.get("overall_score"))
     session.feedback = session_data.get("feedback")
+    await store.put(session.model_dump())
     
     return {"status": "completed", "duration_minutes": session.duration_minutes}
 
 
-@router.get("/sessions", response_model=List[InterviewSession])
-async def get_all_sessions():
-    """Get all interview sessions."""
-    return list(interview_sessions.values())
+def _encode_cursor(record: Dict[str, Any]) -> str:
+    raw = json.dumps([record["start_time"].isoformat(), record["session_id"]])
+    return base64.urlsafe_b64encode(raw.encode()).decode()
+
+
+def _decode_cursor(cursor: str) -> SessionCursor:
+    try:
+        start_time, session_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        return datetime.fromisoformat(start_time), session_id
+    except (binascii.Error, ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def _local_time(value: Optional[datetime]) -> Optional[datetime]:
+    # Sessions are stamped with naive local time; compare like with like
+    if value is not None and value.tzinfo is not None:
+        return value.astimezone().replace(tzinfo=None)
+    return value
+
+
+def _session_json(record: Dict[str, Any], fields: Optional[List[str]]) -> str:
+    if fields is not None:
+        record = {name: record[name] for name in fields}
+    return json.dumps(record, default=datetime.isoformat)
+
+
+@router.get(
+    "/sessions",
+    response_model=SessionPage,
+    responses={
+        200: {"description": "A page, or with format=ndjson one session per line", "content": {"application/x-ndjson": {}}}
+    },
+)
+async def get_all_sessions(
+    limit: int = Query(100, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    role: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+    fields: Optional[str] = Query(None, description="Comma-separated session fields to return"),
+    format: Literal["json", "ndjson"] = "json",
+    store: SessionStore = Depends(get_session_store),
+):
+    """List interview sessions oldest first, one keyset page at a time.
+
+    Returns a ``SessionPage`` (this used to be a bare list of sessions);
+    pass ``next_cursor`` back as ``cursor`` for the next page. With
+    ``format=ndjson`` every matching session from ``cursor`` on is streamed
+    as one JSON object per line, regardless of ``limit``.
+    """
+    where = SessionFilter(role=role, since=_local_time(since), until=_local_time(until), completed=completed)
+    after = _decode_cursor(cursor) if cursor else None
+    projection = [name.strip() for name in fields.split(",") if name.strip()] if fields else None
+    unknown = set(projection or ()).difference(InterviewSession.model_fields)
+    if unknown:
+        raise HTTPException(status_code=422, detail=f"Unknown fields: {', '.join(sorted(unknown))}")
+
+    if format == "ndjson":
+        async def lines():
+            async for record in store.iter_sessions(where, after=after, fields=projection):
+                yield _session_json(record, projection) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    # Records were validated when written, so they are serialized directly
+    page = await store.query_sessions(where, after=after, limit=limit + 1, fields=projection)
+    next_cursor = _encode_cursor(page[limit - 1]) if len(page) > limit else None
+    items = ",".join(_session_json(record, projection) for record in page[:limit])
+    body = f'{{"items":[{items}],"next_cursor":{json.dumps(next_cursor)}}}'
+    return Response(content=body, media_type="application/json")
+
+
+@router.get("/export")
+async def export_all_sessions(
+    format: Optional[Literal["arrow", "parquet", "csv"]] = None,
+    role: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+    completed: Optional[bool] = None,
+    store: SessionStore = Depends(get_session_store),
+):
+    """Download sessions with flattened feedback as Parquet, an Arrow IPC stream or CSV.
+
+    Defaults to Parquet, or CSV when pyarrow is not installed. The file is
+    written in streamed row groups, so large histories are never held in memory.
+    """
+    fmt = format or default_format()
+    if fmt != "csv" and not columnar_available():
+        raise HTTPException(status_code=422, detail="pyarrow is not installed on the server; use format=csv")
+    where = SessionFilter(role=role, since=_local_time(since), until=_local_time(until), completed=completed)
+    return StreamingResponse(
+        export_sessions(store, fmt, where),
+        media_type=MEDIA_TYPES[fmt],
+        headers={"Content-Disposition": f'attachment; filename="sessions.{EXTENSIONS[fmt]}"'},
+    )
 
 
 @router.get("/analytics", response_model=SessionAnalytics)
-async def get_session_analytics():
+async def get_session_analytics(store: SessionStore = Depends(get_session_store)):
     """Get analytics for all sessions."""
-    sessions = list(interview_sessions.values())
-    completed_sessions = [s for s in sessions if s.end_time is not None]
+    totals = await store.aggregates(top_roles=5)
     
-    if not completed_sessions:
+    if not totals.completed:
         return SessionAnalytics(
             total_sessions=0,
             average_duration=0,
@@ -85,45 +205,106 @@ async def get_session_analytics():
             improvement_trends=[]
         )
     
-    # Calculate averages
-    avg_duration = sum(s.duration_minutes or 0 for s in completed_sessions) / len(completed_sessions)
-    scored_sessions = [s for s in completed_sessions if s.overall_score is not None]
-    avg_score = sum(s.overall_score for s in scored_sessions) / len(scored_sessions) if scored_sessions else 0
-    
-    # Most common roles
-    role_counts = {}
-    for session in completed_sessions:
-        role = session.job_title
-        role_counts[role] = role_counts.get(role, 0) + 1
-    
-    most_common_roles = [
-        {"role": role, "count": count} 
-        for role, count in sorted(role_counts.items(), key=lambda x: x[1], reverse=True)[:5]
-    ]
+    # Averages come from running totals kept up to date on every session write
+    avg_duration = totals.duration_sum / totals.completed
+    avg_score = totals.score_sum / totals.scored if totals.scored else 0
+    most_common_roles = [{"role": role, "count": count} for role, count in totals.roles.items()]
+    # Last eight weeks, all roles combined
+    since = bucket_start(datetime.now(), "week") - timedelta(weeks=7)
+    improvement_trends = _trend_points(await store.trends("week", since=since), by_role=False)
     
     return SessionAnalytics(
-        total_sessions=len(completed_sessions),
+        total_sessions=totals.completed,
         average_duration=round(avg_duration, 2),
         average_score=round(avg_score, 2),
         most_common_roles=most_common_roles,
-        improvement_trends=[]  # Could be enhanced with historical data
+        improvement_trends=improvement_trends
     )
 
 
+def _trend_points(rows: List[tuple[date, str, SessionRollup]], by_role: bool) -> List[Dict[str, Any]]:
+    if by_role:
+        return [{"bucket": bucket.isoformat(), "role": role, **rollup.summary()} for bucket, role, rollup in rows]
+    merged: Dict[date, SessionRollup] = {}
+    for bucket, _, rollup in rows:
+        merged.setdefault(bucket, SessionRollup()).merge(rollup)
+    return [{"bucket": bucket.isoformat(), **rollup.summary()} for bucket, rollup in sorted(merged.items())]
+
+
+@router.get("/trends")
+async def get_trends(
+    granularity: Literal["day", "week"] = "week",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    role: Optional[str] = None,
+    by_role: bool = False,
+    store: SessionStore = Depends(get_session_store),
+):
+    """Completed-session count, average/percentile score and average duration per day or week.
+
+    Served from rollups kept up to date as sessions end, never from the raw
+    sessions. Buckets are keyed by the day (or Monday) the sessions started.
+    """
+    rows = await store.trends(granularity, since=since, until=until, role=role)
+    return _trend_points(rows, by_role=by_role or role is not None)
+
+
+@router.get("/percentiles")
+async def get_percentiles(
+    q: str = Query("0.5,0.9,0.99", description="Comma-separated quantiles in [0, 1]"),
+    granularity: Literal["day", "week"] = "week",
+    since: Optional[date] = None,
+    until: Optional[date] = None,
+    role: Optional[str] = None,
+    by_role: bool = False,
+    store: SessionStore = Depends(get_session_store),
+):
+    """Duration and score percentiles of completed sessions, overall or per role.
+
+    Merges the per-bucket quantile sketches of the matching rollups, so the
+    cost depends on the number of buckets, not sessions. Durations are
+    within 1% of the exact value; scores are exact.
+    """
+    try:
+        quantiles = [float(part) for part in q.split(",") if part.strip()]
+    except ValueError:
+        raise HTTPException(status_code=422, detail="q must be comma-separated numbers")
+    if not quantiles or any(not 0 <= value <= 1 for value in quantiles):
+        raise HTTPException(status_code=422, detail="Quantiles must be between 0 and 1")
+
+    merged: Dict[str, SessionRollup] = {}
+    for _, job_title, rollup in await store.trends(granularity, since=since, until=until, role=role):
+        merged.setdefault(job_title if by_role else "*", SessionRollup()).merge(rollup)
+    if not by_role:
+        return merged.get("*", SessionRollup()).percentiles(quantiles)
+    return [{"role": job_title, **rollup.percentiles(quantiles)} for job_title, rollup in sorted(merged.items())]
+
+
+@router.post("/analytics/check")
+async def check_session_analytics(repair: bool = False, store: SessionStore = Depends(get_session_store)):
+    """Rebuild the analytics totals from raw sessions and report any drift."""
+    return await store.check_aggregates(repair=repair)
+
+
+@router.get("/store/stats")
+async def session_store_stats(store: SessionStore = Depends(get_session_store)):
+    return store.stats()
+
+
 @router.get("/session/{session_id}", response_model=InterviewSession)
-async def get_session(session_id: str):
+async def get_session(session_id: str, store: SessionStore = Depends(get_session_store)):
     """Get a specific session."""
-    if session_id not in interview_sessions:
+    record = await store.get(session_id)
+    if record is None:
         raise HTTPException(status_code=404, detail="Session not found")
     
-    return interview_sessions[session_id]
+    return record
 
 
 @router.delete("/session/{session_id}")
-async def delete_session(session_id: str):
+async def delete_session(session_id: str, store: SessionStore = Depends(get_session_store)):
     """Delete a session."""
-    if session_id not in interview_sessions:
+    if not await store.delete(session_id):
         raise HTTPException(status_code=404, detail="Session not found")
     
-    del interview_sessions[session_id]
     return {"status": "deleted"}
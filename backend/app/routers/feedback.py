@@ -1,9 +1,23 @@
-from fastapi import APIRouter, HTTPException
-from pydantic import BaseModel
-from typing import List, Dict, Any
+import asyncio
+from contextlib import AsyncExitStack
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field, ValidationError
+from starlette.background import BackgroundTask
+from starlette.concurrency import run_in_threadpool
+from typing import List, Dict, Any, Optional
 import json
 import os
 
+import numpy as np
+
+from ..services.cache import content_key
+from ..services.json_stream import JsonFieldStream
+from ..services.llm import LLMGateway, get_llm
+from ..services.memo import AsyncMemo
+from ..services.metrics import MetricsEngine, TranscriptCounts
+from ..services.transcript import chunk_transcript, estimate_tokens, truncate_to_tokens
+
 router = APIRouter(prefix="/feedback", tags=["feedback"])
 
 
@@ -22,71 +36,385 @@ class GenerateFeedbackRequest(BaseModel):
     interview_transcript: str
 
 
+class FeedbackParseError(Exception):
+    """The model's reply could not be decoded as feedback JSON."""
+
+
+class TranscriptSegmentError(Exception):
+    """A transcript segment could not be reviewed, so a grade would miss part of the interview."""
+
+
+def _feedback_messages(
+    request: GenerateFeedbackRequest,
+    transcript_label: str = "Interview Transcript",
+    transcript_text: Optional[str] = None,
+) -> List[Dict[str, str]]:
+    resume = truncate_to_tokens(request.candidate_resume, int(os.getenv("FEEDBACK_RESUME_TOKEN_BUDGET", "400")))
+    transcript = request.interview_transcript if transcript_text is None else transcript_text
+    # Create detailed feedback prompt
+    feedback_prompt = f"""
+    You are an expert interview coach. Analyze this interview transcript and provide constructive feedback.
+    
+    Job Position: {request.job_context.get('job_title', 'Unknown')}
+    Job Requirements: {request.job_context.get('qualifications', 'Not specified')}
+    
+    Candidate Resume Summary: {resume}
+    
+    {transcript_label}: {transcript}
+    
+    Please provide detailed feedback in the following JSON format:
+    {{
+        "strengths": ["List 3-5 specific strengths demonstrated"],
+        "improvements": ["List 3-5 specific areas for improvement"],
+        "overall_score": 7,
+        "technical_score": 6,
+        "communication_score": 8,
+        "recommendations": ["List 3-5 actionable recommendations for next interview"]
+    }}
+    
+    Be specific, constructive, and encouraging. Focus on actionable advice.
+    """
+    return [
+        {"role": "system", "content": "You are an expert interview coach providing constructive feedback."},
+        {"role": "user", "content": feedback_prompt}
+    ]
+
+
+def _segment_messages(request: GenerateFeedbackRequest, segment: str, index: int, total: int) -> List[Dict[str, str]]:
+    prompt = f"""
+    You are reviewing part {index} of {total} of a mock interview for the position of
+    {request.job_context.get('job_title', 'Unknown')}. Only judge what is in this part.
+    
+    {segment}
+    
+    Reply with JSON only, in this format:
+    {{
+        "strengths": ["Specific strengths shown in this part"],
+        "improvements": ["Specific weaknesses shown in this part"],
+        "technical_score": 6,
+        "communication_score": 7,
+        "highlights": ["Short notes on notable answers, with concrete details"]
+    }}
+    """
+    return [
+        {"role": "system", "content": "You are an expert interview coach taking concise notes."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _merge_messages(request: GenerateFeedbackRequest, notes: str, index: int, total: int) -> List[Dict[str, str]]:
+    prompt = f"""
+    These are notes from reviewing consecutive parts of a mock interview for the position of
+    {request.job_context.get('job_title', 'Unknown')} (group {index} of {total}). Merge them into
+    one shorter set of notes: combine repeated points, keep concrete details, and average the scores.
+    
+    {notes}
+    
+    Reply with JSON only, in this format:
+    {{
+        "strengths": ["Merged strengths"],
+        "improvements": ["Merged weaknesses"],
+        "technical_score": 6,
+        "communication_score": 7,
+        "highlights": ["The most notable answers, with concrete details"]
+    }}
+    """
+    return [
+        {"role": "system", "content": "You are an expert interview coach condensing your notes."},
+        {"role": "user", "content": prompt}
+    ]
+
+
+def _render_notes(index: int, notes: Dict[str, Any]) -> str:
+    parts = [f"Part {index}:"]
+    for field in ("strengths", "improvements", "highlights"):
+        values = notes.get(field) or []
+        if isinstance(values, list) and values:
+            parts.append(f"{field}: " + "; ".join(str(v) for v in values))
+    for field in ("technical_score", "communication_score"):
+        if isinstance(notes.get(field), (int, float)):
+            parts.append(f"{field}: {notes[field]}/10")
+    return " | ".join(parts)
+
+
+async def _map_segments(
+    request: GenerateFeedbackRequest,
+    segments: List[str],
+    llm: LLMGateway,
+    endpoint: str,
+    messages_fn=_segment_messages,
+) -> List[str]:
+    """Summarize every segment with ``messages_fn``, in order, or fail if any of them is lost."""
+    # Stay below the gateway's in-flight limit so one long transcript does not take every slot
+    parallelism = max(1, min(int(os.getenv("FEEDBACK_MAP_PARALLELISM", "4")), llm.max_inflight - 1))
+    slots = asyncio.Semaphore(parallelism)
+
+    async def review(index: int, segment: str) -> str:
+        async with slots:
+            completion = await llm.chat(
+                endpoint,
+                messages=messages_fn(request, segment, index, len(segments)),
+                max_tokens=300,
+                temperature=0.3,
+            )
+        try:
+            notes = json.loads(completion.choices[0].message.content)
+        except (json.JSONDecodeError, TypeError):
+            notes = None
+        if not isinstance(notes, dict):
+            raise TranscriptSegmentError(f"Could not summarize transcript part {index} of {len(segments)}")
+        return _render_notes(index, notes)
+
+    tasks = [asyncio.ensure_future(review(i, segment)) for i, segment in enumerate(segments, start=1)]
+    try:
+        # A grade from a partial transcript would be wrong, so the first lost segment fails the request
+        await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        for task in tasks:
+            if task.done() and task.exception() is not None:
+                raise task.exception()
+        return [task.result() for task in tasks]
+    finally:
+        for task in tasks:
+            task.cancel()
+
+
+async def _final_messages(request: GenerateFeedbackRequest, llm: LLMGateway, endpoint: str) -> List[Dict[str, str]]:
+    """Prompt for the final feedback call, condensing long transcripts first.
+
+    Transcripts over the token budget are split into turn-aware chunks that are
+    reviewed concurrently (map); the per-chunk notes then replace the raw
+    transcript in the final prompt (reduce). Notes that are themselves over
+    budget are merged again, so the final prompt size stays bounded. If any
+    segment cannot be reviewed the whole request fails rather than grading
+    part of the interview.
+    """
+    budget = int(os.getenv("FEEDBACK_TRANSCRIPT_TOKEN_BUDGET", "3000"))
+    transcript = request.interview_transcript
+    if estimate_tokens(transcript) <= budget:
+        return _feedback_messages(request)
+
+    segments = chunk_transcript(transcript, budget)
+    notes = await _map_segments(request, segments, llm, f"{endpoint}.map")
+    rounds = 1
+    while estimate_tokens("\n".join(notes)) > budget and len(notes) > 1 and rounds < 4:
+        notes = await _map_segments(
+            request, chunk_transcript("\n".join(notes), budget), llm, f"{endpoint}.reduce", _merge_messages
+        )
+        rounds += 1
+    condensed = truncate_to_tokens("\n".join(notes), budget)
+    return _feedback_messages(
+        request,
+        transcript_label=f"Interview Notes (condensed from {len(segments)} transcript segments)",
+        transcript_text="\n" + condensed,
+    )
+
+
+def _fallback_feedback() -> InterviewFeedback:
+    # Fallback if JSON parsing fails
+    return InterviewFeedback(
+        strengths=["Good communication skills", "Relevant experience"],
+        improvements=["Provide more specific examples", "Ask clarifying questions"],
+        overall_score=7,
+        technical_score=6,
+        communication_score=8,
+        recommendations=["Practice STAR method responses", "Research the company more"]
+    )
+
+
+def get_feedback_cache(request: Request) -> AsyncMemo[InterviewFeedback]:
+    return request.app.state.feedback_cache
+
+
+def _feedback_key(request: GenerateFeedbackRequest, model: str) -> str:
+    return content_key(
+        json.dumps(request.job_context, sort_keys=True, default=str),
+        request.candidate_resume,
+        request.interview_transcript,
+        model,
+    )
+
+
+async def _grade_transcript(request: GenerateFeedbackRequest, llm: LLMGateway, endpoint: str) -> InterviewFeedback:
+    messages = await _final_messages(request, llm, endpoint)
+    completion = await llm.chat(
+        endpoint,
+        messages=messages,
+        max_tokens=800,
+        temperature=0.7
+    )
+    
+    # Parse the response
+    response_text = completion.choices[0].message.content
+    try:
+        feedback_data = json.loads(response_text)
+    except json.JSONDecodeError as exc:
+        raise FeedbackParseError(str(exc))
+    return InterviewFeedback(**feedback_data)
+
+
 @router.post("/generate", response_model=InterviewFeedback)
-async def generate_interview_feedback(request: GenerateFeedbackRequest):
-    """Generate AI-powered interview feedback."""
+async def generate_interview_feedback(
+    request: GenerateFeedbackRequest,
+    reuse: bool = Query(False, description="Return an earlier grade of the same job, resume and transcript if one is cached"),
+    llm: LLMGateway = Depends(get_llm),
+    cache: AsyncMemo[InterviewFeedback] = Depends(get_feedback_cache),
+):
+    """Generate AI-powered interview feedback.
+
+    Every call grades afresh unless ``reuse=true``, which serves (and fills)
+    the feedback cache shared with ``/feedback/batch``.
+    """
     try:
-        from cerebras.cloud.sdk import Cerebras
-        
-        api_key = os.getenv("CEREBRAS_API_KEY")
-        if not api_key:
-            raise HTTPException(status_code=500, detail="Cerebras API key not configured")
-        
-        client = Cerebras(api_key=api_key)
-        
-        # Create detailed feedback prompt
-        feedback_prompt = f"""
-        You are an expert interview coach. Analyze this interview transcript and provide constructive feedback.
-        
-        Job Position: {request.job_context.get('job_title', 'Unknown')}
-        Job Requirements: {request.job_context.get('qualifications', 'Not specified')}
-        
-        Candidate Resume Summary: {request.candidate_resume[:300]}...
-        
-        Interview Transcript: {request.interview_transcript}
-        
-        Please provide detailed feedback in the following JSON format:
-        {{
-            "strengths": ["List 3-5 specific strengths demonstrated"],
-            "improvements": ["List 3-5 specific areas for improvement"],
-            "overall_score": 7,
-            "technical_score": 6,
-            "communication_score": 8,
-            "recommendations": ["List 3-5 actionable recommendations for next interview"]
-        }}
-        
-        Be specific, constructive, and encouraging. Focus on actionable advice.
-        """
-        
-        completion = client.chat.completions.create(
-            model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
-            messages=[
-                {"role": "system", "content": "You are an expert interview coach providing constructive feedback."},
-                {"role": "user", "content": feedback_prompt}
-            ],
-            max_tokens=800,
-            temperature=0.7
+        if not reuse:
+            return await _grade_transcript(request, llm, "feedback.generate")
+        return await cache.get_or_compute(
+            _feedback_key(request, llm.model), lambda: _grade_transcript(request, llm, "feedback.generate")
         )
-        
-        # Parse the response
-        response_text = completion.choices[0].message.content
+    except FeedbackParseError:
+        return _fallback_feedback()
+    except TranscriptSegmentError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to generate feedback: {str(e)}")
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Failed to generate feedback: {str(e)}")
+
+
+class BatchFeedbackRequest(BaseModel):
+    items: List[GenerateFeedbackRequest]
+    parallelism: Optional[int] = Field(default=None, ge=1)
+
+
+@router.post("/batch")
+async def generate_feedback_batch(
+    body: BatchFeedbackRequest,
+    llm: LLMGateway = Depends(get_llm),
+    cache: AsyncMemo[InterviewFeedback] = Depends(get_feedback_cache),
+):
+    """Grade many transcripts concurrently, streaming NDJSON results in completion order.
+
+    Identical items (same job, resume, transcript and model) are graded once;
+    repeats point at the first occurrence via ``duplicate_of``. Items graded
+    before are served from the feedback cache. A failing item is reported with
+    ``status: "error"`` and does not affect the others.
+    """
+    max_items = int(os.getenv("FEEDBACK_BATCH_MAX_ITEMS", "200"))
+    if len(body.items) > max_items:
+        raise HTTPException(status_code=422, detail=f"Batch too large ({len(body.items)} items, limit {max_items})")
+    max_parallelism = int(os.getenv("FEEDBACK_BATCH_PARALLELISM", "4"))
+    parallelism = min(body.parallelism or max_parallelism, max_parallelism)
+
+    groups: Dict[str, List[int]] = {}
+    for index, item in enumerate(body.items):
+        groups.setdefault(_feedback_key(item, llm.model), []).append(index)
+
+    slots = asyncio.Semaphore(parallelism)
+
+    async def grade(key: str, indices: List[int]) -> tuple[List[int], Dict[str, Any]]:
+        item = body.items[indices[0]]
+        cached = key in cache
+        compute = lambda: _grade_transcript(item, llm, "feedback.batch")  # noqa: E731
         try:
-            feedback_data = json.loads(response_text)
-            return InterviewFeedback(**feedback_data)
-        except json.JSONDecodeError:
-            # Fallback if JSON parsing fails
-            return InterviewFeedback(
-                strengths=["Good communication skills", "Relevant experience"],
-                improvements=["Provide more specific examples", "Ask clarifying questions"],
-                overall_score=7,
-                technical_score=6,
-                communication_score=8,
-                recommendations=["Practice STAR method responses", "Research the company more"]
-            )
-            
+            if cached:
+                feedback = await cache.get_or_compute(key, compute)
+            else:
+                async with slots:
+                    feedback = await cache.get_or_compute(key, compute)
+            return indices, {"status": "ok", "cached": cached, "feedback": feedback.model_dump()}
+        except FeedbackParseError:
+            return indices, {"status": "ok", "cached": False, "fallback": True, "feedback": _fallback_feedback().model_dump()}
+        except HTTPException as exc:
+            return indices, {"status": "error", "detail": exc.detail}
+        except Exception as exc:
+            return indices, {"status": "error", "detail": f"Failed to generate feedback: {exc}"}
+
+    async def results():
+        tasks = [asyncio.ensure_future(grade(key, indices)) for key, indices in groups.items()]
+        counts = {"ok": 0, "error": 0, "cached": 0}
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                indices, result = await next_done
+                for index in indices:
+                    counts[result["status"]] += 1
+                    counts["cached"] += int(result.get("cached", False))
+                    line = {"type": "item", "index": index, **result}
+                    if index != indices[0]:
+                        line["duplicate_of"] = indices[0]
+                    yield json.dumps(line) + "\n"
+            yield json.dumps({"type": "summary", "total": len(body.items), "unique": len(groups), **counts}) + "\n"
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    return StreamingResponse(results(), media_type="application/x-ndjson")
+
+
+def _sse(event: str, data: Any) -> str:
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+@router.post("/generate/stream")
+async def stream_interview_feedback(request: GenerateFeedbackRequest, llm: LLMGateway = Depends(get_llm)):
+    """Stream interview feedback as server-sent events.
+
+    Emits ``token`` events with raw model output, a ``field`` event as soon as
+    each top-level feedback field is complete, and a final ``feedback`` event
+    with the validated ``InterviewFeedback`` (``error`` on failure).
+    """
+    try:
+        messages = await _final_messages(request, llm, "feedback.generate-stream")
+    except TranscriptSegmentError as e:
+        raise HTTPException(status_code=502, detail=f"Failed to generate feedback: {str(e)}")
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(status_code=500, detail=f"Failed to generate feedback: {str(e)}")
 
+    # Take the LLM slot before the response starts so overload still maps to 429/503
+    stack = AsyncExitStack()
+    client = await stack.enter_async_context(llm.slot("feedback.generate-stream"))
+
+    async def events():
+        parser = JsonFieldStream()
+        try:
+            stream = await client.chat.completions.create(
+                model=llm.model,
+                messages=messages,
+                max_tokens=800,
+                temperature=0.7,
+                stream=True,
+            )
+            async for chunk in stream:
+                if not chunk.choices:
+                    continue
+                delta = chunk.choices[0].delta.content
+                if not delta:
+                    continue
+                yield _sse("token", {"text": delta})
+                for name, value in parser.feed(delta):
+                    yield _sse("field", {"name": name, "value": value})
+
+            try:
+                feedback = InterviewFeedback(**parser.fields)
+            except ValidationError:
+                try:
+                    feedback = InterviewFeedback(**json.loads(parser.text()))
+                except (ValueError, TypeError):
+                    feedback = _fallback_feedback()
+            yield _sse("feedback", feedback.model_dump())
+        except Exception as e:
+            yield _sse("error", {"detail": f"Failed to generate feedback: {str(e)}"})
+        finally:
+            await stack.aclose()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        # Releases the slot even if the client disconnects before streaming starts
+        background=BackgroundTask(stack.aclose),
+    )
+
 
 class InterviewMetrics(BaseModel):
     total_questions: int
@@ -96,17 +424,64 @@ class InterviewMetrics(BaseModel):
     engagement_level: int
 
 
+def get_metrics_engine(request: Request) -> MetricsEngine:
+    return request.app.state.metrics_engine
+
+
+def _metrics_from_counts(counts: TranscriptCounts) -> InterviewMetrics:
+    keywords = counts.keywords
+    return InterviewMetrics(
+        total_questions=counts.questions,
+        response_time_avg=counts.words / max(counts.sentences, 1) * 0.5,  # Rough estimate
+        technical_depth=min(10, keywords.get("technical_depth", 0)),
+        communication_clarity=min(10, keywords.get("communication_clarity", 0)),
+        engagement_level=min(10, keywords.get("engagement_level", 0)),
+    )
+
+
 @router.post("/metrics", response_model=InterviewMetrics)
-async def calculate_interview_metrics(transcript: str):
+async def calculate_interview_metrics(transcript: str, engine: MetricsEngine = Depends(get_metrics_engine)):
     """Calculate interview performance metrics."""
     # Simple heuristics for now - could be enhanced with more sophisticated analysis
-    words = transcript.split()
-    sentences = transcript.split('.')
-    
-    return InterviewMetrics(
-        total_questions=transcript.count('?'),
-        response_time_avg=len(words) / max(sentences.count('.'), 1) * 0.5,  # Rough estimate
-        technical_depth=min(10, transcript.count('technical') + transcript.count('experience') + transcript.count('project')),
-        communication_clarity=min(10, transcript.count('explain') + transcript.count('describe') + transcript.count('example')),
-        engagement_level=min(10, transcript.count('yes') + transcript.count('absolutely') + transcript.count('definitely'))
-    )
+    return _metrics_from_counts(engine.count(transcript))
+
+
+class BatchMetricsRequest(BaseModel):
+    transcripts: List[str]
+
+
+class BatchMetricsResponse(BaseModel):
+    items: List[InterviewMetrics]
+    summary: Dict[str, Dict[str, float]]  # metric -> mean/p50/p90/min/max
+
+
+def _batch_metrics(engine: MetricsEngine, transcripts: List[str]) -> BatchMetricsResponse:
+    items = [_metrics_from_counts(engine.count(t)) for t in transcripts]
+    fields = list(InterviewMetrics.model_fields)
+    summary: Dict[str, Dict[str, float]] = {}
+    if items:
+        values = np.array([[getattr(item, f) for f in fields] for item in items], dtype=float)
+        p50, p90 = np.percentile(values, [50, 90], axis=0)
+        columns = {
+            "mean": values.mean(axis=0),
+            "p50": p50,
+            "p90": p90,
+            "min": values.min(axis=0),
+            "max": values.max(axis=0),
+        }
+        summary = {
+            f: {stat: round(float(column[i]), 3) for stat, column in columns.items()}
+            for i, f in enumerate(fields)
+        }
+    return BatchMetricsResponse(items=items, summary=summary)
+
+
+@router.post("/metrics/batch", response_model=BatchMetricsResponse)
+async def calculate_interview_metrics_batch(
+    body: BatchMetricsRequest, engine: MetricsEngine = Depends(get_metrics_engine)
+):
+    """Calculate metrics for many transcripts plus per-metric aggregates."""
+    max_items = int(os.getenv("METRICS_BATCH_MAX_ITEMS", "10000"))
+    if len(body.transcripts) > max_items:
+        raise HTTPException(status_code=422, detail=f"Batch too large ({len(body.transcripts)} items, limit {max_items})")
+    return await run_in_threadpool(_batch_metrics, engine, body.transcripts)
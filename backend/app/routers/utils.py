@@ -1,11 +1,27 @@
-from fastapi import APIRouter, HTTPException, UploadFile, File
+from fastapi import APIRouter, Depends, HTTPException, Query, Request, UploadFile, File
+from fastapi.responses import StreamingResponse
+from starlette.background import BackgroundTask
 from pydantic import BaseModel, HttpUrl
-import requests
-from bs4 import BeautifulSoup
-import io
-import pdfplumber
+from typing import List, Literal
+from starlette.concurrency import run_in_threadpool
 import os
 import json
+import tempfile
+from contextlib import aclosing, suppress
+
+from ..services.cache import content_key
+from ..services.fetch import Fetcher, FetchError, get_fetcher
+from ..services.llm import LLMGateway, get_llm
+from ..services.memo import AsyncMemo
+from ..services.page_cache import PageCache, get_page_cache
+from ..services.pdf import (
+    PdfExtractor,
+    PdfLimitError,
+    PdfWorkerError,
+    ResumeCache,
+    get_pdf_extractor,
+    get_resume_cache,
+)
 
 
 router = APIRouter(prefix="/utils", tags=["utils"])
@@ -25,25 +41,16 @@ class ParsedJob(BaseModel):
     benefits: str | None = None
 
 
-@router.post("/parse-link", response_model=ParsedJob)
-def parse_link(body: ParseLinkRequest):
+async def _fetch_page_text(pages: PageCache, url: str) -> str:
     try:
-        response = requests.get(
-            str(body.url),
-            timeout=20,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-            },
-        )
-        response.raise_for_status()
-    except Exception as exc:
+        return await pages.get_text(url)
+    except FetchError as exc:
         raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {exc}")
 
-    soup = BeautifulSoup(response.text, "html.parser")
-    text = soup.get_text("\n")
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    cleaned = "\n".join(chunk for chunk in chunks if chunk)
+
+@router.post("/parse-link", response_model=ParsedJob)
+async def parse_link(body: ParseLinkRequest, pages: PageCache = Depends(get_page_cache)):
+    cleaned = await _fetch_page_text(pages, str(body.url))
 
     # Heuristic extraction (placeholder until LLM structured parsing is wired)
     def find_section(keyword: str) -> str | None:
@@ -72,88 +79,200 @@ class ParsePdfRequest(BaseModel):
 
 class ParsedResume(BaseModel):
     text: str
+    engines: List[str] = []  # extraction engine used for each page
+    cached: bool = False
+
+
+ExtractionMode = Literal["auto", "fast", "layout"]
 
 
 @router.post("/parse-pdf", response_model=ParsedResume)
-def parse_pdf(body: ParsePdfRequest):
+async def parse_pdf(
+    body: ParsePdfRequest,
+    fetcher: Fetcher = Depends(get_fetcher),
+    cache: ResumeCache = Depends(get_resume_cache),
+    extractor: PdfExtractor = Depends(get_pdf_extractor),
+    mode: ExtractionMode = "auto",
+):
     try:
-        response = requests.get(str(body.url), timeout=30)
-        response.raise_for_status()
-    except Exception as exc:
+        response = await fetcher.fetch(str(body.url), deadline=30)
+    except FetchError as exc:
         raise HTTPException(status_code=400, detail=f"Failed to fetch PDF: {exc}")
 
-    content_type = response.headers.get("content-type", "")
-    if "pdf" not in content_type:
+    if "pdf" not in response.content_type:
         raise HTTPException(status_code=400, detail="URL does not point to a PDF")
 
     try:
-        with pdfplumber.open(io.BytesIO(response.content)) as pdf:
-            pages_text = [page.extract_text() or "" for page in pdf.pages]
-        text = "\n\n".join(pages_text).strip()
+        result = await cache.extract(response.content, extractor, mode)
+    except PdfLimitError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except PdfWorkerError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to parse PDF: {exc}")
 
-    return ParsedResume(text=text)
+    return ParsedResume(text=result.text, engines=result.engines, cached=result.cached)
 
 
 @router.post("/parse-pdf-upload", response_model=ParsedResume)
-def parse_pdf_upload(file: UploadFile = File(...)):
+async def parse_pdf_upload(
+    file: UploadFile = File(...),
+    cache: ResumeCache = Depends(get_resume_cache),
+    extractor: PdfExtractor = Depends(get_pdf_extractor),
+    mode: ExtractionMode = "auto",
+):
     if not file.filename.lower().endswith(".pdf"):
         raise HTTPException(status_code=400, detail="Only PDF files are supported")
 
     try:
-        content = file.file.read()
-        with pdfplumber.open(io.BytesIO(content)) as pdf:
-            pages_text = [page.extract_text() or "" for page in pdf.pages]
-        text = "\n\n".join(pages_text).strip()
+        content = await file.read()
+        result = await cache.extract(content, extractor, mode)
+    except PdfLimitError as exc:
+        raise HTTPException(status_code=422, detail=str(exc))
+    except PdfWorkerError as exc:
+        raise HTTPException(status_code=503, detail=str(exc))
     except Exception as exc:
         raise HTTPException(status_code=500, detail=f"Failed to parse uploaded PDF: {exc}")
     finally:
-        file.file.close()
+        await file.close()
+
+    return ParsedResume(text=result.text, engines=result.engines, cached=result.cached)
+
+
+async def _spool_upload(file: UploadFile, max_bytes: int, chunk_size: int = 1024 * 1024) -> str:
+    """Copy an upload to a temp file in chunks and return its path; 413 past ``max_bytes``."""
+    fd, path = tempfile.mkstemp(suffix=".pdf")
+    try:
+        written = 0
+        with os.fdopen(fd, "wb") as out:
+            while chunk := await file.read(chunk_size):
+                written += len(chunk)
+                if written > max_bytes:
+                    raise HTTPException(status_code=413, detail=f"Upload exceeds {max_bytes} bytes")
+                await run_in_threadpool(out.write, chunk)
+    except BaseException:
+        os.remove(path)
+        raise
+    return path
+
+
+@router.post("/parse-pdf-stream")
+async def parse_pdf_stream(
+    file: UploadFile = File(...),
+    extractor: PdfExtractor = Depends(get_pdf_extractor),
+    mode: ExtractionMode = "auto",
+    max_pages: int | None = Query(None, ge=1),
+    max_chars: int | None = Query(None, ge=1),
+):
+    """Stream extracted resume text page by page as NDJSON.
+
+    Each line is ``{"type": "page", ...}`` as soon as that page is extracted,
+    followed by a final ``{"type": "done", ...}`` (or ``{"type": "error", ...}``)
+    line. Extraction stops once the page or character budget is reached.
+    """
+    if not file.filename.lower().endswith(".pdf"):
+        raise HTTPException(status_code=400, detail="Only PDF files are supported")
+
+    try:
+        path = await _spool_upload(file, int(os.getenv("PDF_UPLOAD_MAX_BYTES", str(10 * 1024 * 1024))))
+    finally:
+        await file.close()
+
+    page_budget = min(max_pages or extractor.max_pages, extractor.max_pages)
+    char_budget = max_chars or int(os.getenv("PDF_STREAM_MAX_CHARS", "100000"))
+
+    async def events():
+        pages = chars = total_pages = 0
+        truncated = False
+        try:
+            # aclosing: stopping early cancels the look-ahead pages right away, not at GC
+            async with aclosing(extractor.iter_pages(path, mode, page_budget)) as page_iter:
+                async for index, total_pages, text, engine in page_iter:
+                    if chars >= char_budget:
+                        truncated = True
+                        break
+                    if chars + len(text) > char_budget:
+                        text = text[: char_budget - chars]
+                        truncated = True
+                    pages += 1
+                    chars += len(text)
+                    yield json.dumps({"type": "page", "page": index + 1, "engine": engine, "text": text}) + "\n"
+                    if truncated:
+                        break
+            truncated = truncated or pages < total_pages
+            yield json.dumps(
+                {"type": "done", "pages": pages, "total_pages": total_pages, "chars": chars, "truncated": truncated}
+            ) + "\n"
+        except Exception as exc:
+            yield json.dumps({"type": "error", "detail": f"Failed to parse uploaded PDF: {exc}"}) + "\n"
+
+    # The spooled upload is removed after the response, even if the body was never iterated
+    return StreamingResponse(
+        events(), media_type="application/x-ndjson", background=BackgroundTask(_remove_spooled, path)
+    )
+
+
+def _remove_spooled(path: str) -> None:
+    with suppress(FileNotFoundError):
+        os.remove(path)
 
-    return ParsedResume(text=text)
+
+@router.get("/pdf-cache/stats")
+def pdf_cache_stats(cache: ResumeCache = Depends(get_resume_cache)):
+    return cache.stats()
+
+
+@router.get("/page-cache/stats")
+def page_cache_stats(pages: PageCache = Depends(get_page_cache)):
+    return pages.stats()
 
 
 class ParseJobTextRequest(BaseModel):
     text: str
 
 
-def _llm_extract_job_from_text(text: str) -> ParsedJob:
-    try:
-        from cerebras.cloud.sdk import Cerebras  # type: ignore[import-not-found]
-    except Exception as exc:  # pragma: no cover
-        raise HTTPException(status_code=500, detail=f"Cerebras SDK not available: {exc}")
-
-    api_key = os.environ.get("CEREBRAS_API_KEY")
-    if not api_key:
-        raise HTTPException(status_code=500, detail="CEREBRAS_API_KEY not configured")
-
-    client = Cerebras(api_key=api_key)
-
-    job_schema = {
-        "type": "object",
-        "properties": {
-            "job title": {"type": "string"},
-            "job type": {"type": "string", "enum": ["full-time", "part-time", "contract", "internship"]},
-            "location": {"type": "string"},
-            "start date": {"type": "string"},
-            "qualifications": {"type": "string"},
-            "responsibilities": {"type": "string"},
-            "benefits": {"type": "string"},
-        },
-        "required": ["job title"],
-        "additionalProperties": False,
-    }
+JOB_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "job title": {"type": "string"},
+        "job type": {"type": "string", "enum": ["full-time", "part-time", "contract", "internship"]},
+        "location": {"type": "string"},
+        "start date": {"type": "string"},
+        "qualifications": {"type": "string"},
+        "responsibilities": {"type": "string"},
+        "benefits": {"type": "string"},
+    },
+    "required": ["job title"],
+    "additionalProperties": False,
+}
+
+
+def get_job_cache(request: Request) -> AsyncMemo[ParsedJob]:
+    return request.app.state.job_cache
+
+
+def _normalize_job_text(text: str) -> str:
+    # Whitespace differences (copy/paste, HTML cleaning) should not defeat the cache
+    lines = (" ".join(line.split()) for line in text.splitlines())
+    return "\n".join(line for line in lines if line)
 
-    completion = client.chat.completions.create(
-        model=os.environ.get("CEREBRAS_MODEL", "llama3.3-70b"),
+
+async def _extract_job(text: str, cache: AsyncMemo[ParsedJob], llm: LLMGateway, endpoint: str) -> ParsedJob:
+    normalized = _normalize_job_text(text)
+    key = content_key(normalized, llm.model, json.dumps(JOB_SCHEMA, sort_keys=True))
+    return await cache.get_or_compute(key, lambda: _llm_extract_job_from_text(llm, normalized, endpoint))
+
+
+async def _llm_extract_job_from_text(llm: LLMGateway, text: str, endpoint: str) -> ParsedJob:
+    completion = await llm.chat(
+        endpoint,
         messages=[
             {"role": "system", "content": f"You are a link summarizing agent. Extract job information from: {text}"},
             {"role": "user", "content": "Summarize the relevant job information in the required JSON schema."},
         ],
         response_format={
             "type": "json_schema",
-            "json_schema": {"name": "job_schema", "strict": True, "schema": job_schema},
+            "json_schema": {"name": "job_schema", "strict": True, "schema": JOB_SCHEMA},
         },
     )
 
@@ -175,35 +294,33 @@ def _llm_extract_job_from_text(text: str) -> ParsedJob:
 
 
 @router.post("/parse-job-text-llm", response_model=ParsedJob)
-def parse_job_text_llm(body: ParseJobTextRequest):
+async def parse_job_text_llm(
+    body: ParseJobTextRequest,
+    cache: AsyncMemo[ParsedJob] = Depends(get_job_cache),
+    llm: LLMGateway = Depends(get_llm),
+):
     if not body.text.strip():
         raise HTTPException(status_code=400, detail="Text is empty")
-    return _llm_extract_job_from_text(body.text)
+    return await _extract_job(body.text, cache, llm, "utils.parse-job-text-llm")
 
 
 @router.post("/parse-link-llm", response_model=ParsedJob)
-def parse_link_llm(body: ParseLinkRequest):
-    try:
-        resp = requests.get(
-            str(body.url),
-            timeout=20,
-            headers={
-                "User-Agent": "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
-            },
-        )
-        resp.raise_for_status()
-    except Exception as exc:
-        raise HTTPException(status_code=400, detail=f"Failed to fetch URL: {exc}")
-
-    soup = BeautifulSoup(resp.text, "html.parser")
-    text = soup.get_text("\n")
-    lines = (line.strip() for line in text.splitlines())
-    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
-    cleaned = "\n".join(chunk for chunk in chunks if chunk)
+async def parse_link_llm(
+    body: ParseLinkRequest,
+    pages: PageCache = Depends(get_page_cache),
+    cache: AsyncMemo[ParsedJob] = Depends(get_job_cache),
+    llm: LLMGateway = Depends(get_llm),
+):
+    cleaned = await _fetch_page_text(pages, str(body.url))
 
     if not cleaned or len(cleaned) < 100:
         # Many sites (e.g., LinkedIn) require auth/JS; advise pasting raw text instead
         raise HTTPException(status_code=422, detail="Content not accessible. Try /utils/parse-job-text-llm with pasted description.")
 
-    return _llm_extract_job_from_text(cleaned)
+    return await _extract_job(cleaned, cache, llm, "utils.parse-link-llm")
+
+
+@router.get("/job-cache/stats")
+def job_cache_stats(cache: AsyncMemo[ParsedJob] = Depends(get_job_cache)):
+    return cache.stats()
 
@@ -0,0 +1,5 @@
+"""
+Shared services used by the API routers (HTTP fetching, caches, LLM access).
+"""
+
+
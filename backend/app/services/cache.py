@@ -0,0 +1,152 @@
+import hashlib
+import os
+import threading
+from collections import OrderedDict
+from typing import Any
+
+
+def content_key(*parts: bytes | str) -> str:
+    """Stable hex digest over one or more byte/str parts."""
+    digest = hashlib.sha256()
+    for part in parts:
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "big"))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+class TieredCache:
+    """Content-addressed byte cache with an in-memory LRU tier and an on-disk tier.
+
+    Both tiers are bounded by total bytes; the least recently used entries are
+    evicted first. Disk entries are plain files named after their key, so the
+    disk tier survives restarts and can be shared by several worker processes.
+    Safe to use from multiple threads.
+    """
+
+    def __init__(
+        self,
+        directory: str | None,
+        *,
+        max_memory_bytes: int = 32 * 1024 * 1024,
+        max_disk_bytes: int = 256 * 1024 * 1024,
+        suffix: str = ".bin",
+    ) -> None:
+        self.directory = directory
+        self.max_memory_bytes = max_memory_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self.suffix = suffix
+        self._memory: OrderedDict[str, bytes] = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes = 0
+        self._lock = threading.Lock()
+        self.memory_hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+            self._disk_bytes = sum(size for _, size, _ in self._disk_entries())
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory or "", key + self.suffix)
+
+    def _disk_entries(self) -> list[tuple[str, int, float]]:
+        entries = []
+        with os.scandir(self.directory) as it:
+            for entry in it:
+                if entry.is_file() and entry.name.endswith(self.suffix):
+                    stat = entry.stat()
+                    entries.append((entry.path, stat.st_size, stat.st_mtime))
+        return entries
+
+    def _remember(self, key: str, value: bytes) -> None:
+        if len(value) > self.max_memory_bytes:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._memory_bytes -= len(previous)
+        self._memory[key] = value
+        self._memory_bytes += len(value)
+        while self._memory_bytes > self.max_memory_bytes:
+            _, evicted = self._memory.popitem(last=False)
+            self._memory_bytes -= len(evicted)
+            self.evictions += 1
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            value = self._memory.get(key)
+            if value is not None:
+                self._memory.move_to_end(key)
+                self.memory_hits += 1
+                return value
+        if self.directory:
+            path = self._path(key)
+            try:
+                with open(path, "rb") as fh:
+                    value = fh.read()
+                os.utime(path)  # bump recency for disk eviction
+            except OSError:
+                value = None
+            if value is not None:
+                with self._lock:
+                    self.disk_hits += 1
+                    self._remember(key, value)
+                return value
+        with self._lock:
+            self.misses += 1
+        return None
+
+    def put(self, key: str, value: bytes) -> None:
+        with self._lock:
+            self._remember(key, value)
+        if not self.directory or len(value) > self.max_disk_bytes:
+            return
+        path = self._path(key)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            existing = os.path.getsize(path) if os.path.exists(path) else 0
+            with open(tmp_path, "wb") as fh:
+                fh.write(value)
+            os.replace(tmp_path, path)
+        except OSError:
+            try:
+                os.remove(tmp_path)
+            except OSError:
+                pass
+            return
+        with self._lock:
+            self._disk_bytes += len(value) - existing
+            over_budget = self._disk_bytes > self.max_disk_bytes
+        if over_budget:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        entries = sorted(self._disk_entries(), key=lambda e: e[2])
+        total = sum(size for _, size, _ in entries)
+        for path, size, _ in entries:
+            if total <= self.max_disk_bytes:
+                break
+            try:
+                os.remove(path)
+            except OSError:
+                continue
+            total -= size
+            with self._lock:
+                self.evictions += 1
+        with self._lock:
+            self._disk_bytes = total
+
+    def stats(self) -> dict[str, Any]:
+        with self._lock:
+            lookups = self.memory_hits + self.disk_hits + self.misses
+            return {
+                "memory_hits": self.memory_hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "hit_rate": round((self.memory_hits + self.disk_hits) / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "memory_entries": len(self._memory),
+                "memory_bytes": self._memory_bytes,
+                "disk_bytes": self._disk_bytes,
+            }
@@ -0,0 +1,187 @@
+import asyncio
+import csv
+import io
+import json
+from datetime import datetime
+from typing import Any, AsyncIterator
+
+from .sessions import SessionFilter, SessionStore
+
+try:
+    import pyarrow as pa  # type: ignore[import-not-found]
+    import pyarrow.parquet as pq  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    pa = None  # type: ignore
+    pq = None  # type: ignore
+
+
+EXPORT_FORMATS = ("arrow", "parquet", "csv")
+MEDIA_TYPES = {
+    "arrow": "application/vnd.apache.arrow.stream",
+    "parquet": "application/vnd.apache.parquet",
+    "csv": "text/csv",
+}
+EXTENSIONS = {"arrow": "arrows", "parquet": "parquet", "csv": "csv"}
+
+# Feedback keys produced by /feedback/generate get their own columns; anything else lands in feedback_extra
+FEEDBACK_SCORES = ("overall_score", "technical_score", "communication_score")
+FEEDBACK_LISTS = ("strengths", "improvements", "recommendations")
+
+SESSION_INTS = ("duration_minutes", "questions_asked", "candidate_responses", "overall_score")
+
+COLUMNS = (
+    "session_id",
+    "job_title",
+    "start_time",
+    "end_time",
+    "duration_minutes",
+    "questions_asked",
+    "candidate_responses",
+    "overall_score",
+    *(f"feedback_{key}" for key in FEEDBACK_SCORES),
+    *(f"feedback_{key}" for key in FEEDBACK_LISTS),
+    "feedback_extra",
+)
+
+
+def columnar_available() -> bool:
+    return pa is not None
+
+
+def default_format() -> str:
+    return "parquet" if columnar_available() else "csv"
+
+
+def _int_or_none(value: Any) -> int | None:
+    # bool is an int subclass, but True is not a count or a score
+    return value if isinstance(value, int) and not isinstance(value, bool) else None
+
+
+def flatten_session(record: dict[str, Any]) -> dict[str, Any]:
+    """One export row: session columns plus the feedback dict spread into typed columns."""
+    row = {name: record.get(name) for name in COLUMNS[:8]}
+    # Rows stored before /session/end validated its counters may hold strings or floats
+    for name in SESSION_INTS:
+        row[name] = _int_or_none(row[name])
+    feedback = dict(record.get("feedback") or {})
+    for key in FEEDBACK_SCORES:
+        row[f"feedback_{key}"] = _int_or_none(feedback.pop(key, None))
+    for key in FEEDBACK_LISTS:
+        value = feedback.pop(key, None)
+        row[f"feedback_{key}"] = [str(item) for item in value] if isinstance(value, list) else None
+    row["feedback_extra"] = json.dumps(feedback) if feedback else None
+    return row
+
+
+def _arrow_schema() -> "pa.Schema":
+    return pa.schema(
+        [
+            ("session_id", pa.string()),
+            ("job_title", pa.string()),
+            ("start_time", pa.timestamp("us")),
+            ("end_time", pa.timestamp("us")),
+            ("duration_minutes", pa.int64()),
+            ("questions_asked", pa.int64()),
+            ("candidate_responses", pa.int64()),
+            ("overall_score", pa.int64()),
+            *((f"feedback_{key}", pa.int64()) for key in FEEDBACK_SCORES),
+            *((f"feedback_{key}", pa.list_(pa.string())) for key in FEEDBACK_LISTS),
+            ("feedback_extra", pa.string()),
+        ]
+    )
+
+
+class _Spool(io.RawIOBase):
+    """Write-only file object whose contents are handed out and cleared after each batch."""
+
+    def __init__(self) -> None:
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+class _Encoder:
+    """Turns batches of flattened rows into chunks of one export file."""
+
+    def __init__(self, fmt: str) -> None:
+        self.fmt = fmt
+        self._spool = _Spool()
+        if fmt == "csv":
+            self._text = io.StringIO()
+            self._csv = csv.DictWriter(self._text, fieldnames=COLUMNS)
+            self._csv.writeheader()
+            return
+        if not columnar_available():
+            raise RuntimeError("pyarrow is not installed; use the csv format")
+        self._schema = _arrow_schema()
+        if fmt == "arrow":
+            self._writer = pa.ipc.new_stream(self._spool, self._schema)
+        else:
+            self._writer = pq.ParquetWriter(self._spool, self._schema, compression="zstd")
+
+    def _csv_chunk(self) -> bytes:
+        data = self._text.getvalue().encode("utf-8")
+        self._text.seek(0)
+        self._text.truncate()
+        return data
+
+    def encode(self, rows: list[dict[str, Any]]) -> bytes:
+        if self.fmt == "csv":
+            for row in rows:
+                self._csv.writerow(
+                    {
+                        name: json.dumps(value) if isinstance(value, list)
+                        else value.isoformat() if isinstance(value, datetime)
+                        else value
+                        for name, value in row.items()
+                    }
+                )
+            return self._csv_chunk()
+        batch = pa.RecordBatch.from_pylist(rows, schema=self._schema)
+        if self.fmt == "arrow":
+            self._writer.write_batch(batch)
+        else:
+            # One Parquet row group per batch keeps the writer's memory bounded
+            self._writer.write_batch(batch, row_group_size=len(rows))
+        return self._spool.drain()
+
+    def finish(self) -> bytes:
+        if self.fmt == "csv":
+            return self._csv_chunk()
+        self._writer.close()
+        return self._spool.drain()
+
+
+async def export_sessions(
+    store: SessionStore,
+    fmt: str,
+    where: SessionFilter | None = None,
+    *,
+    batch_rows: int = 5000,
+) -> AsyncIterator[bytes]:
+    """Stream matching sessions as an Arrow IPC stream, a Parquet file or CSV.
+
+    Sessions are read ``batch_rows`` at a time through keyset pagination and
+    each batch is encoded (one record batch / row group) before the next is
+    read, so memory stays flat no matter how many sessions are exported.
+    """
+    encoder = _Encoder(fmt)
+    rows: list[dict[str, Any]] = []
+    async for record in store.iter_sessions(where, page_size=batch_rows):
+        rows.append(flatten_session(record))
+        if len(rows) == batch_rows:
+            yield await asyncio.to_thread(encoder.encode, rows)
+            rows = []
+    if rows:
+        yield await asyncio.to_thread(encoder.encode, rows)
+    yield await asyncio.to_thread(encoder.finish)
@@ -0,0 +1,155 @@
+import asyncio
+import os
+from dataclasses import dataclass
+from urllib.parse import urlsplit
+
+import httpx
+from fastapi import Request
+
+
+DEFAULT_USER_AGENT = (
+    "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/127.0.0.0 Safari/537.36"
+)
+
+
+class FetchError(Exception):
+    """Raised when a remote resource cannot be fetched within the configured limits."""
+
+
+@dataclass
+class FetchResult:
+    url: str
+    status_code: int
+    headers: httpx.Headers
+    content: bytes
+    elapsed: float
+
+    @property
+    def content_type(self) -> str:
+        return self.headers.get("content-type", "")
+
+    @property
+    def text(self) -> str:
+        encoding = "utf-8"
+        for part in self.content_type.split(";"):
+            key, _, value = part.strip().partition("=")
+            if key.lower() == "charset" and value:
+                encoding = value.strip('"')
+        try:
+            return self.content.decode(encoding, errors="replace")
+        except LookupError:
+            return self.content.decode("utf-8", errors="replace")
+
+
+class Fetcher:
+    """Pooled async HTTP client with per-host concurrency caps and download limits.
+
+    One instance is created per app lifespan so that connections are reused
+    across requests, and a single slow host can only ever hold
+    ``per_host_limit`` connections instead of draining a worker threadpool.
+    """
+
+    def __init__(
+        self,
+        *,
+        max_connections: int = 100,
+        max_keepalive: int = 20,
+        per_host_limit: int = 4,
+        deadline: float = 20.0,
+        connect_timeout: float = 5.0,
+        read_timeout: float = 10.0,
+        max_bytes: int = 10 * 1024 * 1024,
+        max_redirects: int = 5,
+        max_decompression_ratio: float = 100.0,
+        user_agent: str = DEFAULT_USER_AGENT,
+    ) -> None:
+        self.per_host_limit = per_host_limit
+        self.deadline = deadline
+        self.max_bytes = max_bytes
+        self.max_decompression_ratio = max_decompression_ratio
+        self._host_slots: dict[str, asyncio.Semaphore] = {}
+        self._client = httpx.AsyncClient(
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_keepalive),
+            timeout=httpx.Timeout(read_timeout, connect=connect_timeout, pool=connect_timeout),
+            follow_redirects=True,
+            max_redirects=max_redirects,
+            headers={"User-Agent": user_agent},
+        )
+
+    @classmethod
+    def from_env(cls) -> "Fetcher":
+        return cls(
+            max_connections=int(os.getenv("FETCH_MAX_CONNECTIONS", "100")),
+            per_host_limit=int(os.getenv("FETCH_PER_HOST_LIMIT", "4")),
+            deadline=float(os.getenv("FETCH_DEADLINE_SECONDS", "20")),
+            max_bytes=int(os.getenv("FETCH_MAX_BYTES", str(10 * 1024 * 1024))),
+            max_redirects=int(os.getenv("FETCH_MAX_REDIRECTS", "5")),
+        )
+
+    def _slot(self, host: str) -> asyncio.Semaphore:
+        slot = self._host_slots.get(host)
+        if slot is None:
+            slot = self._host_slots[host] = asyncio.Semaphore(self.per_host_limit)
+        return slot
+
+    async def fetch(
+        self,
+        url: str,
+        *,
+        headers: dict[str, str] | None = None,
+        deadline: float | None = None,
+        max_bytes: int | None = None,
+    ) -> FetchResult:
+        """GET ``url`` and return the (decoded) body, enforcing deadline and size limits."""
+        deadline = deadline or self.deadline
+        try:
+            return await asyncio.wait_for(
+                self._fetch(url, headers or {}, max_bytes or self.max_bytes), timeout=deadline
+            )
+        except asyncio.TimeoutError:
+            raise FetchError(f"Timed out after {deadline:g}s")
+        except httpx.TooManyRedirects:
+            raise FetchError("Too many redirects")
+        except httpx.HTTPStatusError as exc:
+            raise FetchError(f"HTTP {exc.response.status_code} from {exc.request.url}")
+        except httpx.HTTPError as exc:
+            raise FetchError(str(exc) or exc.__class__.__name__)
+
+    async def _fetch(self, url: str, headers: dict[str, str], max_bytes: int) -> FetchResult:
+        host = urlsplit(url).hostname or ""
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        async with self._slot(host):
+            async with self._client.stream("GET", url, headers=headers) as response:
+                if response.status_code != 304:
+                    response.raise_for_status()
+
+                declared = response.headers.get("content-length")
+                if declared and declared.isdigit() and int(declared) > max_bytes:
+                    raise FetchError(f"Response too large ({declared} bytes, limit {max_bytes})")
+
+                body = bytearray()
+                async for chunk in response.aiter_bytes():
+                    body.extend(chunk)
+                    if len(body) > max_bytes:
+                        raise FetchError(f"Response exceeds {max_bytes} bytes")
+                    # Decoded bytes vs. bytes on the wire guards against compression bombs
+                    downloaded = response.num_bytes_downloaded
+                    if downloaded and len(body) / downloaded > self.max_decompression_ratio:
+                        raise FetchError("Response decompression ratio exceeds limit")
+
+                return FetchResult(
+                    url=str(response.url),
+                    status_code=response.status_code,
+                    headers=response.headers,
+                    content=bytes(body),
+                    elapsed=loop.time() - started,
+                )
+
+    async def aclose(self) -> None:
+        await self._client.aclose()
+
+
+def get_fetcher(request: Request) -> Fetcher:
+    """FastAPI dependency returning the app-wide fetcher created in the lifespan."""
+    return request.app.state.fetcher
@@ -0,0 +1,102 @@
+import json
+from typing import Any
+
+
+class JsonFieldStream:
+    """Incrementally parse a streamed JSON object and report top-level fields as they complete.
+
+    Feed it text chunks as they arrive from the model; ``feed`` returns the
+    ``(key, value)`` pairs whose values finished inside that chunk. Anything
+    before the first ``{`` (e.g. a markdown code fence) is ignored, and values
+    that fail to decode are skipped rather than aborting the stream.
+    """
+
+    def __init__(self) -> None:
+        self._raw = ""
+        self._depth = 0
+        self._started = False
+        self._done = False
+        self._in_string = False
+        self._escape = False
+        self._expecting = "key"  # "key" -> "colon" -> "value"
+        self._key: str | None = None
+        self._token_start = 0
+        self._value_start = 0
+        self._value_emitted = False
+        self.fields: dict[str, Any] = {}
+
+    @property
+    def done(self) -> bool:
+        return self._done
+
+    def _emit(self, stop: int, out: list[tuple[str, Any]]) -> None:
+        if self._key is None or self._value_emitted:
+            return
+        self._value_emitted = True
+        try:
+            value = json.loads(self._raw[self._value_start:stop].strip())
+        except ValueError:
+            return
+        self.fields[self._key] = value
+        out.append((self._key, value))
+
+    def feed(self, chunk: str) -> list[tuple[str, Any]]:
+        out: list[tuple[str, Any]] = []
+        offset = len(self._raw)
+        self._raw += chunk
+        if self._done:
+            return out
+
+        for i, ch in enumerate(chunk, start=offset):
+            if not self._started:
+                if ch == "{":
+                    self._started = True
+                    self._depth = 1
+                continue
+
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif ch == "\\":
+                    self._escape = True
+                elif ch == '"':
+                    self._in_string = False
+                    if self._depth == 1 and self._expecting == "key":
+                        try:
+                            self._key = json.loads(self._raw[self._token_start:i + 1])
+                        except ValueError:
+                            self._key = None
+                        self._expecting = "colon"
+                    elif self._depth == 1 and self._expecting == "value":
+                        self._emit(i + 1, out)
+                continue
+
+            if ch == '"':
+                self._in_string = True
+                if self._depth == 1 and self._expecting == "key":
+                    self._token_start = i
+            elif ch == ":" and self._depth == 1 and self._expecting == "colon":
+                self._expecting = "value"
+                self._value_start = i + 1
+                self._value_emitted = False
+            elif ch in "[{":
+                self._depth += 1
+            elif ch in "]}":
+                if self._depth == 1:
+                    if self._expecting == "value":
+                        self._emit(i, out)
+                    self._depth = 0
+                    self._done = True
+                    break
+                self._depth -= 1
+                if self._depth == 1 and self._expecting == "value":
+                    # A list/object value just closed; no need to wait for the comma
+                    self._emit(i + 1, out)
+            elif ch == "," and self._depth == 1 and self._expecting == "value":
+                self._emit(i, out)
+                self._expecting = "key"
+                self._key = None
+        return out
+
+    def text(self) -> str:
+        return self._raw
@@ -0,0 +1,159 @@
+import asyncio
+import os
+import time
+from collections import defaultdict, deque
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator
+
+from fastapi import HTTPException, Request
+
+try:
+    from cerebras.cloud.sdk import AsyncCerebras  # type: ignore[import-not-found]
+except Exception:  # pragma: no cover
+    AsyncCerebras = None  # type: ignore
+
+
+class _EndpointStats:
+    def __init__(self, window: int) -> None:
+        self.requests = 0
+        self.errors = 0
+        self.rejected = 0
+        self.latencies: deque[float] = deque(maxlen=window)
+        self.queue_waits: deque[float] = deque(maxlen=window)
+
+    @staticmethod
+    def _percentile(values: list[float], q: float) -> float:
+        if not values:
+            return 0.0
+        return values[min(len(values) - 1, int(q * len(values)))]
+
+    def snapshot(self) -> dict[str, Any]:
+        latencies = sorted(self.latencies)
+        waits = list(self.queue_waits)
+        return {
+            "requests": self.requests,
+            "errors": self.errors,
+            "rejected": self.rejected,
+            "latency_p50_ms": round(self._percentile(latencies, 0.5) * 1000, 1),
+            "latency_p95_ms": round(self._percentile(latencies, 0.95) * 1000, 1),
+            "queue_wait_avg_ms": round(sum(waits) / len(waits) * 1000, 1) if waits else 0.0,
+        }
+
+
+class LLMGateway:
+    """Process-wide async Cerebras client with a global in-flight limit.
+
+    At most ``max_inflight`` completions run at once. Up to ``max_queue``
+    further callers wait for a slot; beyond that requests are shed with 429,
+    and callers that wait longer than ``queue_timeout`` get 503, so overload
+    turns into fast failures instead of an ever-growing backlog.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        *,
+        model: str = "llama3.3-70b",
+        max_inflight: int = 16,
+        max_queue: int = 64,
+        queue_timeout: float = 10.0,
+        metrics_window: int = 512,
+    ) -> None:
+        self.client = client
+        self.model = model
+        self.max_inflight = max_inflight
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self._slots = asyncio.Semaphore(max_inflight)
+        self._inflight = 0
+        self._waiting = 0
+        self._admitted = 0  # in flight + waiting, counted before the first await
+        self._peak_waiting = 0
+        self._stats: dict[str, _EndpointStats] = defaultdict(lambda: _EndpointStats(metrics_window))
+
+    @classmethod
+    def from_env(cls) -> "LLMGateway":
+        api_key = os.getenv("CEREBRAS_API_KEY")
+        client = AsyncCerebras(api_key=api_key) if AsyncCerebras is not None and api_key else None
+        return cls(
+            client,
+            model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
+            max_inflight=int(os.getenv("LLM_MAX_INFLIGHT", "16")),
+            max_queue=int(os.getenv("LLM_MAX_QUEUE", "64")),
+            queue_timeout=float(os.getenv("LLM_QUEUE_TIMEOUT_SECONDS", "10")),
+        )
+
+    def _require_client(self) -> Any:
+        if self.client is None:
+            if AsyncCerebras is None:
+                raise HTTPException(status_code=500, detail="Cerebras SDK not available")
+            raise HTTPException(status_code=500, detail="CEREBRAS_API_KEY not configured")
+        return self.client
+
+    @asynccontextmanager
+    async def slot(self, endpoint: str) -> AsyncIterator[Any]:
+        """Hold one in-flight slot for ``endpoint`` and yield the client.
+
+        Use directly when the call outlives a single ``await`` (e.g. streaming).
+        """
+        client = self._require_client()
+        stats = self._stats[endpoint]
+        # Admission is decided synchronously, so a burst arriving in one event-loop
+        # tick is bounded too, before any of its tasks has reached the semaphore
+        if self._admitted >= self.max_inflight + self.max_queue:
+            stats.rejected += 1
+            raise HTTPException(status_code=429, detail="LLM capacity exhausted, retry shortly", headers={"Retry-After": "1"})
+
+        self._admitted += 1
+        try:
+            queued_at = time.perf_counter()
+            self._waiting += 1
+            self._peak_waiting = max(self._peak_waiting, self._admitted - self.max_inflight)
+            try:
+                await asyncio.wait_for(self._slots.acquire(), timeout=self.queue_timeout)
+            except asyncio.TimeoutError:
+                stats.rejected += 1
+                raise HTTPException(status_code=503, detail="LLM queue timeout, retry shortly", headers={"Retry-After": "2"})
+            finally:
+                self._waiting -= 1
+
+            started = time.perf_counter()
+            stats.requests += 1
+            stats.queue_waits.append(started - queued_at)
+            self._inflight += 1
+            try:
+                yield client
+            except Exception:
+                stats.errors += 1
+                raise
+            finally:
+                self._inflight -= 1
+                self._slots.release()
+                stats.latencies.append(time.perf_counter() - started)
+        finally:
+            self._admitted -= 1
+
+    async def chat(self, endpoint: str, **kwargs: Any) -> Any:
+        """Run one chat completion under the concurrency limit."""
+        kwargs.setdefault("model", self.model)
+        async with self.slot(endpoint) as client:
+            return await client.chat.completions.create(**kwargs)
+
+    def metrics(self) -> dict[str, Any]:
+        return {
+            "inflight": self._inflight,
+            "max_inflight": self.max_inflight,
+            "queue_depth": self._waiting,
+            "queue_depth_peak": self._peak_waiting,
+            "max_queue": self.max_queue,
+            "endpoints": {name: stats.snapshot() for name, stats in self._stats.items()},
+        }
+
+    async def aclose(self) -> None:
+        if self.client is not None:
+            await self.client.close()
+
+
+def get_llm(request: Request) -> LLMGateway:
+    """FastAPI dependency returning the app-wide LLM gateway."""
+    return request.app.state.llm
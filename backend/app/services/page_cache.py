@@ -0,0 +1,164 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any
+
+from bs4 import BeautifulSoup
+from fastapi import Request
+
+from .fetch import Fetcher
+
+
+logger = logging.getLogger(__name__)
+
+
+def clean_html(html: str) -> str:
+    soup = BeautifulSoup(html, "html.parser")
+    text = soup.get_text("\n")
+    lines = (line.strip() for line in text.splitlines())
+    chunks = (phrase.strip() for line in lines for phrase in line.split("  "))
+    return "\n".join(chunk for chunk in chunks if chunk)
+
+
+@dataclass
+class CachedPage:
+    text: str
+    etag: str | None
+    last_modified: str | None
+    fetched_at: float  # wall-clock time of the last successful fetch/revalidation
+    size_bytes: int
+    fetch_seconds: float
+    clean_seconds: float
+
+
+class PageCache:
+    """Cleaned text of fetched job pages, revalidated with conditional GETs.
+
+    Entries younger than ``ttl`` are served directly. Entries within
+    ``stale_ttl`` after that are served immediately while a single background
+    revalidation refreshes them; anything older is revalidated inline. A 304
+    response skips both the download and the HTML cleaning.
+    """
+
+    def __init__(self, fetcher: Fetcher, *, ttl: float = 900.0, stale_ttl: float = 3600.0, max_entries: int = 512) -> None:
+        self.fetcher = fetcher
+        self.ttl = ttl
+        self.stale_ttl = stale_ttl
+        self.max_entries = max_entries
+        self._entries: OrderedDict[str, CachedPage] = OrderedDict()
+        self._refreshing: dict[str, asyncio.Task] = {}
+        self.fresh_hits = 0
+        self.stale_hits = 0
+        self.not_modified = 0
+        self.misses = 0
+        self.refetches = 0
+        self.bytes_saved = 0
+        self.seconds_saved = 0.0
+
+    @classmethod
+    def from_env(cls, fetcher: Fetcher) -> "PageCache":
+        return cls(
+            fetcher,
+            ttl=float(os.getenv("PAGE_CACHE_TTL_SECONDS", "900")),
+            stale_ttl=float(os.getenv("PAGE_CACHE_STALE_SECONDS", "3600")),
+            max_entries=int(os.getenv("PAGE_CACHE_MAX_ENTRIES", "512")),
+        )
+
+    def _credit(self, *, bytes_saved: int, seconds_saved: float) -> None:
+        self.bytes_saved += bytes_saved
+        self.seconds_saved += max(seconds_saved, 0.0)
+
+    def _store(self, url: str, entry: CachedPage) -> None:
+        self._entries[url] = entry
+        self._entries.move_to_end(url)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_text(self, url: str) -> str:
+        """Return cleaned page text for ``url``; raises ``FetchError`` when it cannot be fetched."""
+        entry = self._entries.get(url)
+        if entry is not None:
+            self._entries.move_to_end(url)
+            age = time.time() - entry.fetched_at
+            if age < self.ttl:
+                self.fresh_hits += 1
+                self._credit(bytes_saved=entry.size_bytes, seconds_saved=entry.fetch_seconds + entry.clean_seconds)
+                return entry.text
+            if age < self.ttl + self.stale_ttl:
+                self.stale_hits += 1
+                self._credit(bytes_saved=0, seconds_saved=entry.fetch_seconds + entry.clean_seconds)
+                if url not in self._refreshing:
+                    task = asyncio.create_task(self._background_refresh(url, entry))
+                    self._refreshing[url] = task
+                    task.add_done_callback(lambda _, url=url: self._refreshing.pop(url, None))
+                return entry.text
+        else:
+            self.misses += 1
+        return (await self._revalidate(url, entry)).text
+
+    async def _background_refresh(self, url: str, entry: CachedPage) -> None:
+        try:
+            await self._revalidate(url, entry)
+        except Exception as exc:
+            logger.warning("Background revalidation of %s failed: %s", url, exc)
+
+    async def _revalidate(self, url: str, entry: CachedPage | None) -> CachedPage:
+        headers = {}
+        if entry is not None:
+            if entry.etag:
+                headers["If-None-Match"] = entry.etag
+            if entry.last_modified:
+                headers["If-Modified-Since"] = entry.last_modified
+
+        result = await self.fetcher.fetch(url, headers=headers)
+        if result.status_code == 304 and entry is not None:
+            self.not_modified += 1
+            self._credit(
+                bytes_saved=entry.size_bytes,
+                seconds_saved=entry.fetch_seconds - result.elapsed + entry.clean_seconds,
+            )
+            entry.fetched_at = time.time()
+            self._store(url, entry)
+            return entry
+
+        if entry is not None:
+            self.refetches += 1
+        started = time.perf_counter()
+        text = await asyncio.get_running_loop().run_in_executor(None, clean_html, result.text)
+        fresh = CachedPage(
+            text=text,
+            etag=result.headers.get("etag"),
+            last_modified=result.headers.get("last-modified"),
+            fetched_at=time.time(),
+            size_bytes=len(result.content),
+            fetch_seconds=result.elapsed,
+            clean_seconds=time.perf_counter() - started,
+        )
+        if "no-store" not in result.headers.get("cache-control", "").lower():
+            self._store(url, fresh)
+        return fresh
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "entries": len(self._entries),
+            "fresh_hits": self.fresh_hits,
+            "stale_hits": self.stale_hits,
+            "not_modified": self.not_modified,
+            "misses": self.misses,
+            "refetches": self.refetches,
+            "bytes_saved": self.bytes_saved,
+            "seconds_saved": round(self.seconds_saved, 3),
+        }
+
+    async def aclose(self) -> None:
+        for task in list(self._refreshing.values()):
+            task.cancel()
+        await asyncio.gather(*self._refreshing.values(), return_exceptions=True)
+
+
+def get_page_cache(request: Request) -> PageCache:
+    """FastAPI dependency returning the app-wide job page cache."""
+    return request.app.state.page_cache
@@ -0,0 +1,321 @@
+import asyncio
+import io
+import json
+import logging
+import multiprocessing
+import os
+import re
+import signal
+import time
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from typing import AsyncIterator
+
+import pdfplumber
+from fastapi import Request
+from PyPDF2 import PdfReader
+
+from .cache import TieredCache, content_key
+
+try:
+    import resource
+except ImportError:  # pragma: no cover - not available on Windows
+    resource = None  # type: ignore
+
+
+logger = logging.getLogger(__name__)
+
+
+# Bump when extraction output changes so stale cache entries are not served
+EXTRACTOR_VERSION = "2"
+
+# "fast" = embedded text layer only, "layout" = pdfplumber only,
+# "auto" = text layer first with per-page pdfplumber fallback
+EXTRACTION_MODES = ("auto", "fast", "layout")
+
+ENGINE_FAST = "pypdf2"
+ENGINE_LAYOUT = "pdfplumber"
+
+# Unresolved glyphs: "(cid:123)" markers, replacement chars, private-use and control chars
+_GARBAGE_RE = re.compile(r"\(cid:\d+\)|[\ufffd\ue000-\uf8ff\x00-\x08\x0b\x0c\x0e-\x1f]")
+
+
+class PdfLimitError(Exception):
+    """Raised when a PDF exceeds the configured page or CPU-time limits."""
+
+
+class PdfWorkerError(Exception):
+    """Raised when an extraction worker dies for a reason other than the CPU-time limit."""
+
+
+@dataclass
+class ExtractedPdf:
+    text: str
+    engines: list[str] = field(default_factory=list)  # engine used for each page
+    cached: bool = False
+
+
+def join_pages(pages_text: list[str]) -> str:
+    return "\n\n".join(pages_text).strip()
+
+
+def text_layer_ok(text: str, *, min_chars: int = 40, max_garbage_ratio: float = 0.05, max_word_length: float = 20.0) -> bool:
+    """Heuristic check that an embedded text layer is usable without layout analysis."""
+    visible = len(text) - text.count(" ") - text.count("\n")
+    if visible < min_chars:
+        return False
+    garbage = sum(len(m) for m in _GARBAGE_RE.findall(text))
+    if garbage / len(text) > max_garbage_ratio:
+        return False
+    # Text layers without proper spacing come out as run-together words
+    words = text.split()
+    return visible / max(len(words), 1) <= max_word_length
+
+
+def _apply_cpu_limit(cpu_seconds: float) -> None:
+    # Hard backstop: the kernel kills the worker if a single page runs away.
+    # The limit is relative to what this (reused) worker has already consumed.
+    if resource is None:
+        return
+    usage = resource.getrusage(resource.RUSAGE_SELF)
+    used = usage.ru_utime + usage.ru_stime
+    _, hard = resource.getrlimit(resource.RLIMIT_CPU)
+    soft = int(used + cpu_seconds) + 2
+    if hard != resource.RLIM_INFINITY:
+        soft = min(soft, hard)
+    resource.setrlimit(resource.RLIMIT_CPU, (soft, hard))
+
+
+def _open_source(source: bytes | str):
+    # Sources are either raw bytes or the path of a spooled upload on disk
+    return io.BytesIO(source) if isinstance(source, bytes) else source
+
+
+def _count_pages(source: bytes | str, cpu_seconds: float) -> int:
+    _apply_cpu_limit(cpu_seconds)
+    return len(PdfReader(_open_source(source)).pages)
+
+
+def extract_page_range(source: bytes | str, start: int, stop: int, mode: str, cpu_seconds: float) -> list[tuple[str, str]]:
+    """Extract ``(text, engine)`` for pages ``[start, stop)``.
+
+    Runs as a process-pool task, but is a plain function so it can also be
+    called directly (e.g. from benchmarks).
+    """
+    _apply_cpu_limit(cpu_seconds)
+    deadline = time.process_time() + cpu_seconds
+    results: list[tuple[str, str]] = []
+    reader = PdfReader(_open_source(source)) if mode != "layout" else None
+    layout = None
+    try:
+        for index in range(start, stop):
+            text = None
+            if reader is not None:
+                try:
+                    text = reader.pages[index].extract_text() or ""
+                except Exception:
+                    text = None
+            if text is not None and (mode == "fast" or text_layer_ok(text)):
+                results.append((text, ENGINE_FAST))
+            else:
+                # Only pay for pdfplumber's layout engine on pages that need it
+                if layout is None:
+                    layout = pdfplumber.open(_open_source(source))
+                results.append((layout.pages[index].extract_text() or "", ENGINE_LAYOUT))
+            if time.process_time() > deadline:
+                raise PdfLimitError(f"PDF extraction exceeded {cpu_seconds:g}s of CPU time")
+    finally:
+        if layout is not None:
+            layout.close()
+    return results
+
+
+def _exit_signals(processes: list, timeout: float = 2.0) -> set[int]:
+    signals = set()
+    for process in processes:
+        process.join(timeout)
+        if process.exitcode is not None and process.exitcode < 0:
+            signals.add(-process.exitcode)
+    return signals
+
+
+class PdfExtractor:
+    """Runs PDF text extraction in a process pool so it never holds the API's GIL.
+
+    Long documents are split into page ranges that are extracted in parallel.
+    Every task is bounded by ``cpu_seconds`` of CPU time and documents longer
+    than ``max_pages`` are rejected up front. A worker killed by the CPU
+    limit fails its task with ``PdfLimitError``; any other worker death is a
+    ``PdfWorkerError``. Tasks that were merely in flight on the broken pool
+    are retried once on its replacement.
+    """
+
+    def __init__(
+        self,
+        *,
+        workers: int | None = None,
+        pages_per_task: int = 4,
+        max_pages: int = 50,
+        cpu_seconds: float = 20.0,
+    ) -> None:
+        self.workers = workers or os.cpu_count() or 1
+        self.pages_per_task = max(1, pages_per_task)
+        self.max_pages = max_pages
+        self.cpu_seconds = cpu_seconds
+        self._pool = self._new_pool()
+        self._breakage: tuple[ProcessPoolExecutor, asyncio.Future] | None = None  # last broken pool, its exit signals
+
+    @classmethod
+    def from_env(cls) -> "PdfExtractor":
+        return cls(
+            workers=int(os.getenv("PDF_WORKERS", "0")) or None,
+            pages_per_task=int(os.getenv("PDF_PAGES_PER_TASK", "4")),
+            max_pages=int(os.getenv("PDF_MAX_PAGES", "50")),
+            cpu_seconds=float(os.getenv("PDF_CPU_SECONDS", "20")),
+        )
+
+    def _new_pool(self) -> ProcessPoolExecutor:
+        # spawn avoids forking a multi-threaded server process
+        return ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context("spawn"))
+
+    async def _replace_pool(self, pool: ProcessPoolExecutor) -> bool:
+        """Swap in a fresh pool once per breakage; returns whether a worker was killed by the CPU rlimit."""
+        if self._pool is pool:
+            self._pool = self._new_pool()
+            processes = list((getattr(pool, "_processes", None) or {}).values())
+            pool.shutdown(wait=False, cancel_futures=True)
+            # The pool terminates the surviving workers (SIGTERM); the culprit's own signal tells why it died
+            signals = asyncio.get_running_loop().run_in_executor(None, _exit_signals, processes)
+            self._breakage = (pool, signals)
+        if self._breakage is None or self._breakage[0] is not pool:
+            return False
+        return signal.SIGXCPU in await asyncio.shield(self._breakage[1])
+
+    async def _run(self, fn, *args, retry: bool = True):
+        pool = self._pool
+        loop = asyncio.get_running_loop()
+        started = time.monotonic()
+        try:
+            return await loop.run_in_executor(pool, fn, *args)
+        except BrokenProcessPool:
+            cpu_killed = await self._replace_pool(pool)
+        # One dead worker fails every task in flight on the pool. A task that ran for less
+        # than the CPU budget cannot be the one the rlimit killed, so it gets one more try.
+        if cpu_killed and time.monotonic() - started >= self.cpu_seconds:
+            raise PdfLimitError(f"PDF extraction exceeded {self.cpu_seconds:g}s of CPU time")
+        if retry:
+            return await self._run(fn, *args, retry=False)
+        raise PdfWorkerError("PDF extraction worker terminated unexpectedly")
+
+    async def extract(self, content: bytes, mode: str = "auto") -> ExtractedPdf:
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        page_count = await self._run(_count_pages, content, self.cpu_seconds)
+        if page_count > self.max_pages:
+            raise PdfLimitError(f"PDF has {page_count} pages (limit {self.max_pages})")
+
+        ranges = [
+            (start, min(start + self.pages_per_task, page_count))
+            for start in range(0, page_count, self.pages_per_task)
+        ]
+        chunks = await asyncio.gather(
+            *(self._run(extract_page_range, content, start, stop, mode, self.cpu_seconds) for start, stop in ranges)
+        )
+        pages = [page for chunk in chunks for page in chunk]
+        return ExtractedPdf(text=join_pages([text for text, _ in pages]), engines=[engine for _, engine in pages])
+
+    async def iter_pages(
+        self, source: bytes | str, mode: str = "auto", max_pages: int | None = None
+    ) -> AsyncIterator[tuple[int, int, str, str]]:
+        """Yield ``(page_index, page_count, text, engine)`` in page order as soon as each page is ready.
+
+        Pages are extracted one task each with a small look-ahead window, so
+        only a handful of pages are ever in flight or buffered. Stopping the
+        iteration early cancels pages that have not started yet.
+        """
+        if mode not in EXTRACTION_MODES:
+            raise ValueError(f"Unknown extraction mode: {mode}")
+        page_count = await self._run(_count_pages, source, self.cpu_seconds)
+        limit = min(page_count, max_pages if max_pages is not None else self.max_pages)
+
+        window = self.workers + 1
+        pending: dict[int, asyncio.Future] = {}
+        next_page = 0
+        try:
+            for index in range(limit):
+                while next_page < limit and len(pending) < window:
+                    pending[next_page] = asyncio.ensure_future(
+                        self._run(extract_page_range, source, next_page, next_page + 1, mode, self.cpu_seconds)
+                    )
+                    next_page += 1
+                [(text, engine)] = await pending.pop(index)
+                yield index, page_count, text, engine
+        finally:
+            for future in pending.values():
+                future.cancel()
+
+    def shutdown(self) -> None:
+        self._pool.shutdown(wait=True, cancel_futures=True)
+
+
+class ResumeCache:
+    """Parsed resume text keyed by a hash of the raw PDF bytes."""
+
+    def __init__(self, cache: TieredCache) -> None:
+        self._cache = cache
+
+    @classmethod
+    def from_env(cls) -> "ResumeCache":
+        default_dir = os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "resumes")
+        directory = os.getenv("PDF_CACHE_DIR", default_dir) or None
+        return cls(
+            TieredCache(
+                directory,
+                max_memory_bytes=int(os.getenv("PDF_CACHE_MEMORY_BYTES", str(32 * 1024 * 1024))),
+                max_disk_bytes=int(os.getenv("PDF_CACHE_DISK_BYTES", str(256 * 1024 * 1024))),
+                suffix=".json",
+            )
+        )
+
+    @staticmethod
+    def key(content: bytes, mode: str) -> str:
+        return content_key(EXTRACTOR_VERSION, mode, content)
+
+    def get(self, content: bytes, mode: str) -> ExtractedPdf | None:
+        value = self._cache.get(self.key(content, mode))
+        if value is None:
+            return None
+        try:
+            data = json.loads(value)
+            return ExtractedPdf(text=data["text"], engines=data["engines"], cached=True)
+        except (ValueError, KeyError, TypeError) as exc:
+            # A truncated or stale-format entry is a miss; the fresh extraction overwrites it
+            logger.warning(f"Ignoring unreadable cached resume extraction: {exc}")
+            return None
+
+    def put(self, content: bytes, mode: str, result: ExtractedPdf) -> None:
+        value = json.dumps({"text": result.text, "engines": result.engines})
+        self._cache.put(self.key(content, mode), value.encode("utf-8"))
+
+    async def extract(self, content: bytes, extractor: PdfExtractor, mode: str = "auto") -> ExtractedPdf:
+        """Return the cached extraction for ``content``, running ``extractor`` on a miss."""
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(None, self.get, content, mode)
+        if result is None:
+            result = await extractor.extract(content, mode)
+            await loop.run_in_executor(None, self.put, content, mode, result)
+        return result
+
+    def stats(self) -> dict:
+        return self._cache.stats()
+
+
+def get_resume_cache(request: Request) -> ResumeCache:
+    """FastAPI dependency returning the app-wide resume cache."""
+    return request.app.state.resume_cache
+
+
+def get_pdf_extractor(request: Request) -> PdfExtractor:
+    """FastAPI dependency returning the app-wide PDF extraction pool."""
+    return request.app.state.pdf_extractor
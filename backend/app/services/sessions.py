@@ -0,0 +1,690 @@
+import asyncio
+import heapq
+import json
+import os
+import queue
+import sqlite3
+import threading
+from abc import ABC, abstractmethod
+from concurrent.futures import Future
+from dataclasses import dataclass, field
+from datetime import date, datetime
+from typing import Any, AsyncIterator, Callable, Iterable
+
+from fastapi import Request
+
+from .trends import RollupKey, SessionRollup, rollup_keys
+
+
+# Column order of the sessions table; records are plain dicts with these keys
+SESSION_FIELDS = (
+    "session_id",
+    "job_title",
+    "start_time",
+    "end_time",
+    "duration_minutes",
+    "questions_asked",
+    "candidate_responses",
+    "overall_score",
+    "feedback",
+)
+
+
+@dataclass
+class SessionFilter:
+    role: str | None = None
+    since: datetime | None = None  # inclusive, on start_time
+    until: datetime | None = None  # exclusive, on start_time
+    completed: bool | None = None
+
+    def matches(self, record: dict[str, Any]) -> bool:
+        return (
+            (self.role is None or record["job_title"] == self.role)
+            and (self.since is None or record["start_time"] >= self.since)
+            and (self.until is None or record["start_time"] < self.until)
+            and (self.completed is None or (record["end_time"] is not None) == self.completed)
+        )
+
+
+# Keyset position: the (start_time, session_id) of the last record already returned
+SessionCursor = tuple[datetime, str]
+
+
+@dataclass
+class SessionAggregates:
+    """Running totals over completed sessions, maintained on every write."""
+
+    completed: int = 0
+    duration_sum: int = 0
+    scored: int = 0
+    score_sum: int = 0
+    roles: dict[str, int] = field(default_factory=dict)
+    rollups: dict[RollupKey, SessionRollup] = field(default_factory=dict)
+
+    def apply(self, record: dict[str, Any] | None, sign: int) -> None:
+        """Add (``sign=1``) or remove (``sign=-1``) one session's contribution."""
+        if record is None or record.get("end_time") is None:
+            return
+        self.completed += sign
+        self.duration_sum += sign * (record.get("duration_minutes") or 0)
+        if record.get("overall_score") is not None:
+            self.scored += sign
+            self.score_sum += sign * record["overall_score"]
+        role = record["job_title"]
+        count = self.roles.get(role, 0) + sign
+        if count > 0:
+            self.roles[role] = count
+        else:
+            self.roles.pop(role, None)
+        for key in rollup_keys(record):
+            rollup = self.rollups.setdefault(key, SessionRollup())
+            rollup.apply(record, sign)
+            if not rollup.sessions:
+                del self.rollups[key]
+
+    @classmethod
+    def rebuild(cls, records: Iterable[dict[str, Any]]) -> "SessionAggregates":
+        totals = cls()
+        for record in records:
+            totals.apply(record, 1)
+        return totals
+
+    def top_roles(self, k: int) -> list[tuple[str, int]]:
+        return heapq.nsmallest(k, self.roles.items(), key=lambda item: (-item[1], item[0]))
+
+
+class SessionStore(ABC):
+    """Storage backend for interview sessions.
+
+    Records are dicts keyed by ``SESSION_FIELDS`` with ``datetime`` times and
+    ``feedback`` as a dict. Implementations must be safe to share between
+    concurrent requests.
+    """
+
+    @abstractmethod
+    async def put(self, record: dict[str, Any]) -> None:
+        """Insert or replace a session."""
+
+    @abstractmethod
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        ...
+
+    @abstractmethod
+    async def delete(self, session_id: str) -> bool:
+        """Remove a session; returns False if it did not exist."""
+
+    @abstractmethod
+    async def query_sessions(
+        self,
+        where: SessionFilter | None = None,
+        *,
+        after: SessionCursor | None = None,
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        """Sessions ordered by ``(start_time, session_id)``, starting after ``after``.
+
+        ``fields`` limits the returned keys; ``session_id`` and ``start_time``
+        are always included so the last record can serve as the next cursor.
+        """
+
+    async def iter_sessions(
+        self,
+        where: SessionFilter | None = None,
+        *,
+        after: SessionCursor | None = None,
+        fields: Iterable[str] | None = None,
+        page_size: int = 500,
+    ) -> AsyncIterator[dict[str, Any]]:
+        """Walk every matching session one keyset page at a time, holding one page in memory."""
+        while True:
+            page = await self.query_sessions(where, after=after, limit=page_size, fields=fields)
+            for record in page:
+                yield record
+            if len(page) < page_size:
+                return
+            after = (page[-1]["start_time"], page[-1]["session_id"])
+
+    @abstractmethod
+    async def aggregates(self, top_roles: int = 5) -> SessionAggregates:
+        """Current totals; ``roles`` holds only the ``top_roles`` most common roles."""
+
+    @abstractmethod
+    async def trends(
+        self,
+        granularity: str,
+        *,
+        since: date | None = None,
+        until: date | None = None,
+        role: str | None = None,
+    ) -> list[tuple[date, str, SessionRollup]]:
+        """Per-role rollups of ``granularity`` buckets starting in ``[since, until)``, oldest first."""
+
+    @abstractmethod
+    async def check_aggregates(self, repair: bool = False) -> dict[str, Any]:
+        """Recompute the totals from the raw sessions and compare them with the stored ones.
+
+        With ``repair`` the stored totals are replaced by the recomputed ones
+        when they disagree.
+        """
+
+    def stats(self) -> dict[str, Any]:
+        return {}
+
+    async def aclose(self) -> None:
+        pass
+
+    @staticmethod
+    def from_env() -> "SessionStore":
+        backend = os.getenv("SESSION_STORE", "sqlite").lower()
+        if backend == "memory":
+            return MemorySessionStore()
+        if backend != "sqlite":
+            raise ValueError(f"Unknown SESSION_STORE backend: {backend}")
+        default_path = os.path.join(os.path.dirname(__file__), "..", "..", ".cache", "sessions.db")
+        return SqliteSessionStore(
+            os.getenv("SESSION_DB_PATH", default_path),
+            pool_size=int(os.getenv("SESSION_DB_POOL_SIZE", "4")),
+            batch_size=int(os.getenv("SESSION_DB_BATCH_SIZE", "64")),
+        )
+
+
+class MemorySessionStore(SessionStore):
+    """Process-local store; sessions are lost on restart and not shared between workers."""
+
+    def __init__(self) -> None:
+        self._sessions: dict[str, dict[str, Any]] = {}
+        self._totals = SessionAggregates()
+
+    async def put(self, record: dict[str, Any]) -> None:
+        self._totals.apply(self._sessions.get(record["session_id"]), -1)
+        self._sessions[record["session_id"]] = dict(record)
+        self._totals.apply(record, 1)
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        record = self._sessions.get(session_id)
+        return dict(record) if record is not None else None
+
+    async def delete(self, session_id: str) -> bool:
+        record = self._sessions.pop(session_id, None)
+        self._totals.apply(record, -1)
+        return record is not None
+
+    async def query_sessions(
+        self,
+        where: SessionFilter | None = None,
+        *,
+        after: SessionCursor | None = None,
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        where = where or SessionFilter()
+        keys = _projection(fields)
+        records = sorted(
+            (r for r in self._sessions.values() if where.matches(r) and (after is None or (r["start_time"], r["session_id"]) > after)),
+            key=lambda r: (r["start_time"], r["session_id"]),
+        )
+        return [{key: record[key] for key in keys} for record in records[:limit]]
+
+    async def aggregates(self, top_roles: int = 5) -> SessionAggregates:
+        totals = self._totals
+        return SessionAggregates(
+            totals.completed, totals.duration_sum, totals.scored, totals.score_sum, dict(totals.top_roles(top_roles))
+        )
+
+    async def trends(
+        self,
+        granularity: str,
+        *,
+        since: date | None = None,
+        until: date | None = None,
+        role: str | None = None,
+    ) -> list[tuple[date, str, SessionRollup]]:
+        return sorted(
+            (bucket, job_title, rollup)
+            for (g, bucket, job_title), rollup in self._totals.rollups.items()
+            if g == granularity
+            and (since is None or bucket >= since)
+            and (until is None or bucket < until)
+            and (role is None or job_title == role)
+        )
+
+    async def check_aggregates(self, repair: bool = False) -> dict[str, Any]:
+        expected = SessionAggregates.rebuild(self._sessions.values())
+        report = _consistency_report(self._totals, expected)
+        if repair and not report["consistent"]:
+            self._totals = expected
+        return report
+
+    def stats(self) -> dict[str, Any]:
+        return {"backend": "memory", "sessions": len(self._sessions)}
+
+
+def _projection(fields: Iterable[str] | None) -> tuple[str, ...]:
+    if fields is None:
+        return SESSION_FIELDS
+    wanted = {"session_id", "start_time", *fields}
+    unknown = wanted.difference(SESSION_FIELDS)
+    if unknown:
+        raise ValueError(f"Unknown session fields: {', '.join(sorted(unknown))}")
+    return tuple(name for name in SESSION_FIELDS if name in wanted)
+
+
+def _consistency_report(stored: SessionAggregates, expected: SessionAggregates) -> dict[str, Any]:
+    mismatches = {
+        name: {"stored": getattr(stored, name), "expected": getattr(expected, name)}
+        for name in ("completed", "duration_sum", "scored", "score_sum")
+        if getattr(stored, name) != getattr(expected, name)
+    }
+    roles = {
+        role: {"stored": stored.roles.get(role, 0), "expected": expected.roles.get(role, 0)}
+        for role in stored.roles.keys() | expected.roles.keys()
+        if stored.roles.get(role, 0) != expected.roles.get(role, 0)
+    }
+    if roles:
+        mismatches["roles"] = roles
+    rollups = sorted(
+        f"{granularity}/{bucket.isoformat()}/{role}"
+        for granularity, bucket, role in stored.rollups.keys() | expected.rollups.keys()
+        if stored.rollups.get((granularity, bucket, role)) != expected.rollups.get((granularity, bucket, role))
+    )
+    if rollups:
+        mismatches["rollups"] = rollups
+    return {"consistent": not mismatches, "mismatches": mismatches}
+
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS sessions (
+    session_id TEXT PRIMARY KEY,
+    job_title TEXT NOT NULL,
+    start_time TEXT NOT NULL,
+    end_time TEXT,
+    duration_minutes INTEGER,
+    questions_asked INTEGER NOT NULL DEFAULT 0,
+    candidate_responses INTEGER NOT NULL DEFAULT 0,
+    overall_score INTEGER,
+    feedback TEXT
+);
+CREATE INDEX IF NOT EXISTS sessions_start_time ON sessions (start_time, session_id);
+CREATE INDEX IF NOT EXISTS sessions_job_title ON sessions (job_title, start_time);
+CREATE INDEX IF NOT EXISTS sessions_end_time ON sessions (end_time);
+CREATE TABLE IF NOT EXISTS session_totals (
+    id INTEGER PRIMARY KEY CHECK (id = 0),
+    completed INTEGER NOT NULL,
+    duration_sum INTEGER NOT NULL,
+    scored INTEGER NOT NULL,
+    score_sum INTEGER NOT NULL
+);
+CREATE TABLE IF NOT EXISTS role_counts (
+    job_title TEXT PRIMARY KEY,
+    completed INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS role_counts_completed ON role_counts (completed DESC);
+CREATE TABLE IF NOT EXISTS session_rollups (
+    granularity TEXT NOT NULL,
+    bucket TEXT NOT NULL,
+    job_title TEXT NOT NULL,
+    rollup TEXT NOT NULL,
+    PRIMARY KEY (granularity, bucket, job_title)
+);
+"""
+
+
+# Bump whenever the totals/rollups layout changes so existing databases are rebuilt
+_AGGREGATES_VERSION = 2
+
+
+def _time_to_db(value: datetime | None) -> str | None:
+    # Fixed-width ISO strings sort chronologically, so the indexes serve range scans
+    return value.isoformat(timespec="microseconds") if value is not None else None
+
+
+def _to_row(record: dict[str, Any]) -> tuple:
+    row = dict(record)
+    row["start_time"] = _time_to_db(row.get("start_time"))
+    row["end_time"] = _time_to_db(row.get("end_time"))
+    feedback = row.get("feedback")
+    row["feedback"] = json.dumps(feedback) if feedback is not None else None
+    return tuple(row.get(name) for name in SESSION_FIELDS)
+
+
+def _from_row(row: tuple, fields: tuple[str, ...] = SESSION_FIELDS) -> dict[str, Any]:
+    record = dict(zip(fields, row))
+    record["start_time"] = datetime.fromisoformat(record["start_time"])
+    if record.get("end_time") is not None:
+        record["end_time"] = datetime.fromisoformat(record["end_time"])
+    if record.get("feedback") is not None:
+        record["feedback"] = json.loads(record["feedback"])
+    return record
+
+
+def _read_totals(conn: sqlite3.Connection, top_roles: int | None = None) -> SessionAggregates:
+    """Stored totals; without ``top_roles`` every role and every rollup is loaded too."""
+    row = conn.execute("SELECT completed, duration_sum, scored, score_sum FROM session_totals WHERE id = 0").fetchone()
+    query = "SELECT job_title, completed FROM role_counts ORDER BY completed DESC, job_title"
+    if top_roles is not None:
+        return SessionAggregates(*(row or (0, 0, 0, 0)), roles=dict(conn.execute(query + " LIMIT ?", (top_roles,))))
+    rollups = {
+        (granularity, date.fromisoformat(bucket), role): SessionRollup.from_json(json.loads(data))
+        for granularity, bucket, role, data in conn.execute("SELECT * FROM session_rollups")
+    }
+    return SessionAggregates(*(row or (0, 0, 0, 0)), roles=dict(conn.execute(query)), rollups=rollups)
+
+
+def _write_totals(conn: sqlite3.Connection, totals: SessionAggregates) -> None:
+    conn.execute(
+        "INSERT OR REPLACE INTO session_totals VALUES (0, ?, ?, ?, ?)",
+        (totals.completed, totals.duration_sum, totals.scored, totals.score_sum),
+    )
+    conn.execute("DELETE FROM role_counts")
+    conn.executemany("INSERT INTO role_counts VALUES (?, ?)", totals.roles.items())
+    conn.execute("DELETE FROM session_rollups")
+    conn.executemany(
+        "INSERT INTO session_rollups VALUES (?, ?, ?, ?)",
+        (
+            (granularity, bucket.isoformat(), role, json.dumps(rollup.to_json()))
+            for (granularity, bucket, role), rollup in totals.rollups.items()
+        ),
+    )
+
+
+def _apply_totals(conn: sqlite3.Connection, row: tuple | None, sign: int) -> None:
+    # Same bookkeeping as SessionAggregates.apply, done in SQL inside the write's transaction
+    if row is None:
+        return
+    record = dict(zip(SESSION_FIELDS, row))
+    record["start_time"] = datetime.fromisoformat(record["start_time"])
+    delta = SessionAggregates()
+    delta.apply(record, sign)
+    if not delta.completed:
+        return
+    conn.execute(
+        "UPDATE session_totals SET completed = completed + ?, duration_sum = duration_sum + ?, "
+        "scored = scored + ?, score_sum = score_sum + ? WHERE id = 0",
+        (delta.completed, delta.duration_sum, delta.scored, delta.score_sum),
+    )
+    role = record["job_title"]
+    conn.execute(
+        "INSERT INTO role_counts VALUES (?, ?) "
+        "ON CONFLICT (job_title) DO UPDATE SET completed = completed + excluded.completed",
+        (role, sign),
+    )
+    if sign < 0:
+        conn.execute("DELETE FROM role_counts WHERE job_title = ? AND completed <= 0", (role,))
+    for (granularity, bucket, job_title), change in delta.rollups.items():
+        key = (granularity, bucket.isoformat(), job_title)
+        stored = conn.execute(
+            "SELECT rollup FROM session_rollups WHERE granularity = ? AND bucket = ? AND job_title = ?", key
+        ).fetchone()
+        rollup = SessionRollup.from_json(json.loads(stored[0])) if stored else SessionRollup()
+        rollup.merge(change)
+        if rollup.sessions > 0:
+            conn.execute("INSERT OR REPLACE INTO session_rollups VALUES (?, ?, ?, ?)", (*key, json.dumps(rollup.to_json())))
+        else:
+            conn.execute("DELETE FROM session_rollups WHERE granularity = ? AND bucket = ? AND job_title = ?", key)
+
+
+_SELECT = f"SELECT {', '.join(SESSION_FIELDS)} FROM sessions"
+_UPSERT = (
+    f"INSERT OR REPLACE INTO sessions ({', '.join(SESSION_FIELDS)}) "
+    f"VALUES ({', '.join('?' * len(SESSION_FIELDS))})"
+)
+
+
+class SqliteSessionStore(SessionStore):
+    """Sessions in an embedded SQLite database in WAL mode.
+
+    The file can be shared by every worker process on the host: WAL lets
+    readers proceed while one process writes. Reads use a small pool of
+    connections on worker threads. Writes are queued to a single writer
+    thread that commits everything waiting in one transaction (group
+    commit), so a burst of session updates costs one fsync rather than one
+    per request. Each write still resolves only after its batch commits.
+    """
+
+    def __init__(self, path: str, *, pool_size: int = 4, batch_size: int = 64, busy_timeout: float = 5.0) -> None:
+        self.path = path
+        self.batch_size = batch_size
+        self.busy_timeout = busy_timeout
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+
+        self._writer = self._connect()
+        self._writer.execute("PRAGMA journal_mode=WAL")
+        self._writer.executescript(_SCHEMA)
+        self._bootstrap_totals()
+        self._readers: queue.Queue[sqlite3.Connection] = queue.Queue()
+        self._all_readers = [self._connect() for _ in range(max(1, pool_size))]
+        for conn in self._all_readers:
+            self._readers.put(conn)
+
+        self._writes: queue.Queue[tuple[Callable[[sqlite3.Connection], Any], Future] | None] = queue.Queue()
+        self.writes = 0
+        self.commits = 0
+        self.failed_commits = 0
+        self._thread = threading.Thread(target=self._write_loop, name="session-store-writer", daemon=True)
+        self._thread.start()
+
+    def _bootstrap_totals(self) -> None:
+        # Databases written with an older totals layout (PRAGMA user_version) start from a full rebuild
+        conn = self._writer
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if conn.execute("PRAGMA user_version").fetchone()[0] < _AGGREGATES_VERSION:
+                rows = conn.execute(_SELECT).fetchall()
+                _write_totals(conn, SessionAggregates.rebuild(_from_row(row) for row in rows))
+                conn.execute(f"PRAGMA user_version = {_AGGREGATES_VERSION}")
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+    def _connect(self) -> sqlite3.Connection:
+        # Autocommit mode: each read sees the latest committed data, writes manage their own transaction
+        conn = sqlite3.connect(self.path, timeout=self.busy_timeout, isolation_level=None, check_same_thread=False)
+        conn.execute("PRAGMA synchronous=NORMAL")
+        return conn
+
+    def _write_loop(self) -> None:
+        while True:
+            item = self._writes.get()
+            if item is None:
+                return
+            batch = [item]
+            stop = False
+            # Drain whatever queued up while the previous batch was committing
+            while len(batch) < self.batch_size:
+                try:
+                    item = self._writes.get_nowait()
+                except queue.Empty:
+                    break
+                if item is None:
+                    stop = True
+                    break
+                batch.append(item)
+            self._commit(batch)
+            if stop:
+                return
+
+    def _commit(self, batch: list[tuple[Callable[[sqlite3.Connection], Any], Future]]) -> None:
+        conn = self._writer
+        outcomes: list[tuple[Future, Any, BaseException | None]] = []
+        try:
+            conn.execute("BEGIN IMMEDIATE")
+            for op, future in batch:
+                if not future.set_running_or_notify_cancel():
+                    continue
+                # A savepoint per write, so one bad write does not sink the rest of the batch
+                conn.execute("SAVEPOINT write")
+                try:
+                    outcomes.append((future, op(conn), None))
+                except Exception as exc:
+                    conn.execute("ROLLBACK TO write")
+                    outcomes.append((future, None, exc))
+                conn.execute("RELEASE write")
+            conn.execute("COMMIT")
+        except Exception as exc:
+            if conn.in_transaction:
+                conn.execute("ROLLBACK")
+            self.failed_commits += 1
+            for op, future in batch:
+                if future.running():
+                    future.set_exception(exc)
+            return
+        self.commits += 1
+        self.writes += len(outcomes)
+        for future, result, error in outcomes:
+            if error is not None:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    async def _write(self, op: Callable[[sqlite3.Connection], Any]) -> Any:
+        future: Future = Future()
+        self._writes.put((op, future))
+        return await asyncio.wrap_future(future)
+
+    def _read_sync(self, op: Callable[[sqlite3.Connection], Any]) -> Any:
+        conn = self._readers.get()
+        try:
+            return op(conn)
+        finally:
+            self._readers.put(conn)
+
+    async def _read(self, op: Callable[[sqlite3.Connection], Any]) -> Any:
+        return await asyncio.to_thread(self._read_sync, op)
+
+    async def put(self, record: dict[str, Any]) -> None:
+        row = _to_row(record)
+
+        def op(conn: sqlite3.Connection) -> None:
+            old = conn.execute(f"{_SELECT} WHERE session_id = ?", (row[0],)).fetchone()
+            conn.execute(_UPSERT, row)
+            _apply_totals(conn, old, -1)
+            _apply_totals(conn, row, 1)
+
+        await self._write(op)
+
+    async def get(self, session_id: str) -> dict[str, Any] | None:
+        def op(conn: sqlite3.Connection) -> dict[str, Any] | None:
+            row = conn.execute(f"{_SELECT} WHERE session_id = ?", (session_id,)).fetchone()
+            return _from_row(row) if row is not None else None
+
+        return await self._read(op)
+
+    async def delete(self, session_id: str) -> bool:
+        def op(conn: sqlite3.Connection) -> bool:
+            old = conn.execute(f"{_SELECT} WHERE session_id = ?", (session_id,)).fetchone()
+            if old is None:
+                return False
+            conn.execute("DELETE FROM sessions WHERE session_id = ?", (session_id,))
+            _apply_totals(conn, old, -1)
+            return True
+
+        return await self._write(op)
+
+    async def query_sessions(
+        self,
+        where: SessionFilter | None = None,
+        *,
+        after: SessionCursor | None = None,
+        limit: int | None = None,
+        fields: Iterable[str] | None = None,
+    ) -> list[dict[str, Any]]:
+        where = where or SessionFilter()
+        columns = _projection(fields)
+        clauses: list[str] = []
+        params: list[Any] = []
+        if where.role is not None:
+            clauses.append("job_title = ?")
+            params.append(where.role)
+        if where.since is not None:
+            clauses.append("start_time >= ?")
+            params.append(_time_to_db(where.since))
+        if where.until is not None:
+            clauses.append("start_time < ?")
+            params.append(_time_to_db(where.until))
+        if where.completed is not None:
+            clauses.append("end_time IS NOT NULL" if where.completed else "end_time IS NULL")
+        if after is not None:
+            # Row-value comparison lets the (start_time, session_id) index seek straight to the page
+            clauses.append("(start_time, session_id) > (?, ?)")
+            params.extend((_time_to_db(after[0]), after[1]))
+        sql = f"SELECT {', '.join(columns)} FROM sessions"
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        sql += " ORDER BY start_time, session_id"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+
+        def op(conn: sqlite3.Connection) -> list[dict[str, Any]]:
+            return [_from_row(row, columns) for row in conn.execute(sql, params)]
+
+        return await self._read(op)
+
+    async def aggregates(self, top_roles: int = 5) -> SessionAggregates:
+        return await self._read(lambda conn: _read_totals(conn, top_roles))
+
+    async def trends(
+        self,
+        granularity: str,
+        *,
+        since: date | None = None,
+        until: date | None = None,
+        role: str | None = None,
+    ) -> list[tuple[date, str, SessionRollup]]:
+        clauses = ["granularity = ?"]
+        params: list[Any] = [granularity]
+        if since is not None:
+            clauses.append("bucket >= ?")
+            params.append(since.isoformat())
+        if until is not None:
+            clauses.append("bucket < ?")
+            params.append(until.isoformat())
+        if role is not None:
+            clauses.append("job_title = ?")
+            params.append(role)
+        sql = f"SELECT bucket, job_title, rollup FROM session_rollups WHERE {' AND '.join(clauses)} ORDER BY bucket, job_title"
+
+        def op(conn: sqlite3.Connection) -> list[tuple[date, str, SessionRollup]]:
+            return [
+                (date.fromisoformat(bucket), job_title, SessionRollup.from_json(json.loads(data)))
+                for bucket, job_title, data in conn.execute(sql, params)
+            ]
+
+        return await self._read(op)
+
+    async def check_aggregates(self, repair: bool = False) -> dict[str, Any]:
+        # Runs on the writer so the comparison and the repair see the same snapshot
+        def op(conn: sqlite3.Connection) -> dict[str, Any]:
+            expected = SessionAggregates.rebuild(_from_row(row) for row in conn.execute(_SELECT))
+            report = _consistency_report(_read_totals(conn), expected)
+            if repair and not report["consistent"]:
+                _write_totals(conn, expected)
+            return report
+
+        return await self._write(op)
+
+    def stats(self) -> dict[str, Any]:
+        return {
+            "backend": "sqlite",
+            "path": os.path.abspath(self.path),
+            "pending_writes": self._writes.qsize(),
+            "writes": self.writes,
+            "commits": self.commits,
+            "failed_commits": self.failed_commits,
+            "writes_per_commit": round(self.writes / self.commits, 2) if self.commits else 0.0,
+        }
+
+    async def aclose(self) -> None:
+        self._writes.put(None)
+        await asyncio.to_thread(self._thread.join)
+        self._writer.close()
+        for conn in self._all_readers:
+            conn.close()
+
+
+def get_session_store(request: Request) -> SessionStore:
+    """FastAPI dependency returning the app-wide session store."""
+    return request.app.state.session_store
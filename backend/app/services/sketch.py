@@ -0,0 +1,84 @@
+import math
+from dataclasses import dataclass, field
+from typing import Any
+
+
+@dataclass
+class QuantileSketch:
+    """Mergeable quantile sketch with a relative-error guarantee (DDSketch-style).
+
+    Positive values fall into logarithmic buckets ``(gamma^(k-1), gamma^k]``;
+    any quantile is then answered within ``relative_accuracy`` of the true
+    value. Because a value always lands in the same bucket, sketches merge by
+    adding bucket counts (across rollups or worker processes) and a value can
+    be removed again with ``add(value, -1)``. Values <= 0 share one bucket.
+    """
+
+    relative_accuracy: float = 0.01
+    bins: dict[int, int] = field(default_factory=dict)
+    zero_count: int = 0
+    count: int = 0
+
+    @property
+    def _log_gamma(self) -> float:
+        return math.log((1 + self.relative_accuracy) / (1 - self.relative_accuracy))
+
+    def add(self, value: float, count: int = 1) -> None:
+        self.count += count
+        if value <= 0:
+            self.zero_count += count
+            return
+        key = math.ceil(math.log(value) / self._log_gamma)
+        total = self.bins.get(key, 0) + count
+        if total:
+            self.bins[key] = total
+        else:
+            self.bins.pop(key, None)
+
+    def merge(self, other: "QuantileSketch") -> None:
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        self.count += other.count
+        self.zero_count += other.zero_count
+        for key, count in other.bins.items():
+            total = self.bins.get(key, 0) + count
+            if total:
+                self.bins[key] = total
+            else:
+                self.bins.pop(key, None)
+
+    def quantile(self, q: float) -> float | None:
+        if self.count <= 0:
+            return None
+        rank = q * (self.count - 1)
+        seen = self.zero_count
+        if seen > rank:
+            return 0.0
+        log_gamma = self._log_gamma
+        key = None
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if seen > rank:
+                break
+        if key is None:
+            return 0.0
+        # Midpoint (in relative terms) of the bucket, which bounds the error on both sides
+        gamma = math.exp(log_gamma)
+        return 2 * math.exp(key * log_gamma) / (gamma + 1)
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "relative_accuracy": self.relative_accuracy,
+            "bins": {str(key): count for key, count in self.bins.items()},
+            "zero_count": self.zero_count,
+            "count": self.count,
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "QuantileSketch":
+        return cls(
+            relative_accuracy=data["relative_accuracy"],
+            bins={int(key): count for key, count in data["bins"].items()},
+            zero_count=data["zero_count"],
+            count=data["count"],
+        )
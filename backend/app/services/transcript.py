@@ -0,0 +1,81 @@
+import re
+
+
+# Lines such as "Interviewer: ..." / "Candidate: ..." / "[00:01] Agent: ..." start a new turn
+_TURN_RE = re.compile(r"^\s*(?:\[[^\]]{1,20}\]\s*)?[A-Za-z][A-Za-z0-9 _.'-]{0,30}:\s", re.MULTILINE)
+_SENTENCE_RE = re.compile(r"(?<=[.!?])\s+")
+
+# Rough English average; good enough for budgeting without shipping a tokenizer
+CHARS_PER_TOKEN = 4
+
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+
+def truncate_to_tokens(text: str, budget: int) -> str:
+    """Cut ``text`` to roughly ``budget`` tokens, preferring a line or sentence boundary."""
+    limit = budget * CHARS_PER_TOKEN
+    if len(text) <= limit:
+        return text
+    cut = text[:limit]
+    boundary = max(cut.rfind("\n"), cut.rfind(". "))
+    if boundary > limit // 2:
+        cut = cut[: boundary + 1]
+    return cut.rstrip() + " ..."
+
+
+def split_turns(transcript: str) -> list[str]:
+    """Split a transcript into speaker turns, falling back to paragraphs."""
+    starts = [m.start() for m in _TURN_RE.finditer(transcript)]
+    if len(starts) < 2:
+        return [p.strip() for p in re.split(r"\n\s*\n", transcript) if p.strip()]
+    if starts[0] != 0:
+        starts.insert(0, 0)
+    bounds = starts + [len(transcript)]
+    turns = (transcript[a:b].strip() for a, b in zip(bounds, bounds[1:]))
+    return [turn for turn in turns if turn]
+
+
+def _split_oversized(turn: str, budget: int) -> list[str]:
+    pieces: list[str] = []
+    current = ""
+    for sentence in _SENTENCE_RE.split(turn):
+        while estimate_tokens(sentence) > budget:
+            # A single run-on "sentence" longer than the budget: hard split
+            head, sentence = sentence[: budget * CHARS_PER_TOKEN], sentence[budget * CHARS_PER_TOKEN:]
+            if current:
+                pieces.append(current)
+                current = ""
+            pieces.append(head)
+        candidate = f"{current} {sentence}".strip()
+        if current and estimate_tokens(candidate) > budget:
+            pieces.append(current)
+            candidate = sentence
+        current = candidate
+    if current:
+        pieces.append(current)
+    return pieces
+
+
+def chunk_transcript(transcript: str, budget: int) -> list[str]:
+    """Pack whole turns into chunks of at most ``budget`` estimated tokens.
+
+    Turns are never split unless a single turn exceeds the budget on its own,
+    in which case it is split on sentence boundaries.
+    """
+    chunks: list[str] = []
+    current: list[str] = []
+    used = 0
+    for turn in split_turns(transcript):
+        pieces = [turn] if estimate_tokens(turn) <= budget else _split_oversized(turn, budget)
+        for piece in pieces:
+            cost = estimate_tokens(piece) + 1
+            if current and used + cost > budget:
+                chunks.append("\n".join(current))
+                current, used = [], 0
+            current.append(piece)
+            used += cost
+    if current:
+        chunks.append("\n".join(current))
+    return chunks
@@ -0,0 +1,138 @@
+from dataclasses import dataclass, field
+from datetime import date, datetime, timedelta
+from typing import Any
+
+from .sketch import QuantileSketch
+
+
+TREND_GRANULARITIES = ("day", "week")
+
+
+def bucket_start(moment: datetime, granularity: str) -> date:
+    """First day of the day/week (weeks start on Monday) containing ``moment``."""
+    day = moment.date()
+    if granularity == "week":
+        return day - timedelta(days=day.weekday())
+    if granularity == "day":
+        return day
+    raise ValueError(f"Unknown granularity: {granularity}")
+
+
+@dataclass
+class SessionRollup:
+    """Totals for the completed sessions of one role in one time bucket.
+
+    Scores are small integers, so a score -> count histogram gives exact
+    percentiles, merges by addition and, unlike a sample, supports removing
+    a session again when it is re-ended or deleted. Durations go into a
+    ``QuantileSketch``, which has the same properties with bounded error.
+    """
+
+    sessions: int = 0
+    duration_sum: int = 0
+    scored: int = 0
+    score_sum: int = 0
+    scores: dict[int, int] = field(default_factory=dict)
+    durations: QuantileSketch = field(default_factory=QuantileSketch)
+
+    def apply(self, record: dict[str, Any], sign: int) -> None:
+        self.sessions += sign
+        self.duration_sum += sign * (record.get("duration_minutes") or 0)
+        self.durations.add(record.get("duration_minutes") or 0, sign)
+        score = record.get("overall_score")
+        if score is not None:
+            self.scored += sign
+            self.score_sum += sign * score
+            count = self.scores.get(score, 0) + sign
+            if count:
+                self.scores[score] = count
+            else:
+                self.scores.pop(score, None)
+
+    def merge(self, other: "SessionRollup") -> None:
+        self.sessions += other.sessions
+        self.duration_sum += other.duration_sum
+        self.scored += other.scored
+        self.score_sum += other.score_sum
+        self.durations.merge(other.durations)
+        for score, count in other.scores.items():
+            count += self.scores.get(score, 0)
+            if count:
+                self.scores[score] = count
+            else:
+                self.scores.pop(score, None)
+
+    def score_percentile(self, q: float) -> float | None:
+        if not self.scored:
+            return None
+        rank = q * (self.scored - 1)
+        seen = 0
+        for score in sorted(self.scores):
+            seen += self.scores[score]
+            if seen > rank:
+                return float(score)
+        return float(max(self.scores))
+
+    def percentiles(self, quantiles: list[float]) -> dict[str, Any]:
+        def label(q: float) -> str:
+            return f"p{q * 100:g}"
+
+        return {
+            "sessions": self.sessions,
+            "duration_minutes": {label(q): _rounded(self.durations.quantile(q)) for q in quantiles},
+            "score": {label(q): self.score_percentile(q) for q in quantiles},
+        }
+
+    def summary(self) -> dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "average_duration": round(self.duration_sum / self.sessions, 2) if self.sessions else 0.0,
+            "average_score": round(self.score_sum / self.scored, 2) if self.scored else None,
+            "p50_score": self.score_percentile(0.5),
+            "p90_score": self.score_percentile(0.9),
+        }
+
+    def to_json(self) -> dict[str, Any]:
+        return {
+            "sessions": self.sessions,
+            "duration_sum": self.duration_sum,
+            "scored": self.scored,
+            "score_sum": self.score_sum,
+            "scores": {str(score): count for score, count in self.scores.items()},
+            "durations": self.durations.to_json(),
+        }
+
+    @classmethod
+    def from_json(cls, data: dict[str, Any]) -> "SessionRollup":
+        return cls(
+            sessions=data["sessions"],
+            duration_sum=data["duration_sum"],
+            scored=data["scored"],
+            score_sum=data["score_sum"],
+            scores=_score_histogram(data["scores"]),
+            durations=QuantileSketch.from_json(data["durations"]),
+        )
+
+
+def _score_histogram(stored: dict[str, Any]) -> dict[int, int]:
+    # Rows written before scores were validated can hold keys like "7.5"; skip
+    # those buckets rather than failing every rollup read that touches the row
+    scores = {}
+    for score, count in stored.items():
+        try:
+            scores[int(score)] = count
+        except (TypeError, ValueError):
+            continue
+    return scores
+
+
+def _rounded(value: float | None) -> float | None:
+    return round(value, 2) if value is not None else None
+
+
+# (granularity, bucket start, role) -> rollup
+RollupKey = tuple[str, date, str]
+
+
+def rollup_keys(record: dict[str, Any]) -> list[RollupKey]:
+    return [(g, bucket_start(record["start_time"], g), record["job_title"]) for g in TREND_GRANULARITIES]
@@ -0,0 +1,83 @@
+#!/usr/bin/env python
+"""Benchmark resume PDF extraction modes over a corpus of sample PDFs.
+
+Usage:
+    python backend/bench_pdf_extraction.py path/to/resumes [--repeat 3]
+
+For every PDF in the directory this runs the "layout" (pdfplumber only),
+"fast" (PyPDF2 text layer only) and "auto" (text layer with per-page
+pdfplumber fallback) modes in-process and reports timings, which engine
+handled each page, and how closely the auto output matches layout output.
+"""
+import argparse
+import difflib
+import statistics
+import sys
+import time
+from collections import Counter
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from app.services.pdf import EXTRACTION_MODES, _count_pages, extract_page_range, join_pages
+
+# Large enough that the CPU guard never trips while benchmarking
+CPU_SECONDS = 10_000.0
+
+
+def run_mode(content: bytes, mode: str) -> tuple[float, list[tuple[str, str]]]:
+    started = time.perf_counter()
+    page_count = _count_pages(content, CPU_SECONDS)
+    pages = extract_page_range(content, 0, page_count, mode, CPU_SECONDS)
+    return time.perf_counter() - started, pages
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("corpus", type=Path, help="directory containing sample resume PDFs")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per file and mode (median is reported)")
+    args = parser.parse_args()
+
+    files = sorted(args.corpus.glob("*.pdf"))
+    if not files:
+        raise SystemExit(f"No PDFs found in {args.corpus}")
+
+    totals = {mode: 0.0 for mode in EXTRACTION_MODES}
+    engines = Counter()
+    similarities = []
+
+    print(f"{'file':40} {'pages':>5} " + " ".join(f"{mode + ' ms':>10}" for mode in EXTRACTION_MODES) + "  similarity")
+    for path in files:
+        content = path.read_bytes()
+        outputs = {}
+        timings = {}
+        for mode in EXTRACTION_MODES:
+            runs = []
+            for _ in range(args.repeat):
+                elapsed, pages = run_mode(content, mode)
+                runs.append(elapsed)
+            timings[mode] = statistics.median(runs)
+            totals[mode] += timings[mode]
+            outputs[mode] = pages
+
+        engines.update(engine for _, engine in outputs["auto"])
+        similarity = difflib.SequenceMatcher(
+            None, join_pages([t for t, _ in outputs["layout"]]), join_pages([t for t, _ in outputs["auto"]])
+        ).ratio()
+        similarities.append(similarity)
+        print(
+            f"{path.name[:40]:40} {len(outputs['auto']):>5} "
+            + " ".join(f"{timings[mode] * 1000:>10.1f}" for mode in EXTRACTION_MODES)
+            + f"  {similarity:>10.3f}"
+        )
+
+    print()
+    for mode in EXTRACTION_MODES:
+        speedup = totals["layout"] / totals[mode] if totals[mode] else float("inf")
+        print(f"{mode:>6}: total {totals[mode] * 1000:.1f} ms ({speedup:.1f}x vs layout)")
+    print(f"auto engines: {dict(engines)}")
+    print(f"auto vs layout text similarity: median {statistics.median(similarities):.3f}, min {min(similarities):.3f}")
+
+
+if __name__ == "__main__":
+    main()
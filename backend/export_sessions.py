@@ -0,0 +1,60 @@
+#!/usr/bin/env python
+"""Export interview sessions from the session store to a columnar file.
+
+Usage:
+    python backend/export_sessions.py sessions.parquet [--format parquet|arrow|csv]
+        [--role "Backend Engineer"] [--since 2026-01-01] [--until 2026-04-01] [--completed]
+
+Reads the store configured by SESSION_STORE / SESSION_DB_PATH (see
+env.example) directly, so the API does not need to be running. The format
+defaults to the output file's extension.
+"""
+import argparse
+import asyncio
+import os
+import sys
+from datetime import datetime
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).parent))
+
+from dotenv import load_dotenv
+
+from app.services.export import EXPORT_FORMATS, EXTENSIONS, default_format, export_sessions
+from app.services.sessions import SessionFilter, SessionStore
+
+
+async def run(args: argparse.Namespace, fmt: str) -> int:
+    store = SessionStore.from_env()
+    where = SessionFilter(role=args.role, since=args.since, until=args.until, completed=args.completed)
+    written = 0
+    try:
+        with open(args.output, "wb") as fh:
+            async for chunk in export_sessions(store, fmt, where, batch_rows=args.batch_rows):
+                fh.write(chunk)
+                written += len(chunk)
+    finally:
+        await store.aclose()
+    return written
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("output")
+    parser.add_argument("--format", choices=EXPORT_FORMATS)
+    parser.add_argument("--role")
+    parser.add_argument("--since", type=datetime.fromisoformat)
+    parser.add_argument("--until", type=datetime.fromisoformat)
+    parser.add_argument("--completed", action="store_true", default=None, help="only sessions that have ended")
+    parser.add_argument("--batch-rows", type=int, default=5000, help="rows per record batch / row group")
+    args = parser.parse_args()
+
+    load_dotenv(dotenv_path=os.path.join(os.path.dirname(__file__), ".env"))
+    by_extension = {ext: fmt for fmt, ext in EXTENSIONS.items()}
+    fmt = args.format or by_extension.get(Path(args.output).suffix.lstrip("."), default_format())
+    written = asyncio.run(run(args, fmt))
+    print(f"wrote {written / 1e6:.1f} MB of {fmt} to {args.output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -25,18 +25,34 @@ logger = logging.getLogger(__name__)
 from livekit import agents
 from livekit.agents import JobContext, WorkerOptions, JobRequest
 from app.agents.interviewer import Assistant
+from app.agents.warmup import JobTimer, prewarm, shared_vad, warm_connections
 from datetime import datetime
 from livekit.agents import ChatContext, AgentSession
-from livekit.plugins import deepgram, openai, silero
+from livekit.plugins import deepgram, openai
 import json
 
 
 async def interview_entrypoint(ctx: JobContext):
     """Interview agent entrypoint."""
     logger.info(f"Agent joining room: {ctx.room.name}")
+    timer = JobTimer(ctx)
     
     try:
+        # Build the provider plugins first so their connections warm up while we join the room
+        stt = deepgram.STT(model="nova-2")
+        llm = openai.LLM.with_cerebras(
+            model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
+            temperature=float(os.getenv("AGENT_TEMPERATURE", "0.7")),
+            api_key=os.getenv("CEREBRAS_API_KEY"),
+        )
+        tts = deepgram.TTS(
+            model=os.getenv("DEEPGRAM_TTS_MODEL", "aura-asteria-en"),
+            api_key=os.getenv("DEEPGRAM_API_KEY"),
+        )
+        warm_connections(stt, llm, tts)
+        
         await ctx.connect()
+        timer.mark("connected")
         logger.info("Connected to room")
         
         # Get room metadata if available
@@ -61,20 +77,8 @@ async def interview_entrypoint(ctx: JobContext):
         
         logger.info("Creating agent session...")
         
-        # Create session with Cerebras LLM
-        session = AgentSession(
-            vad=silero.VAD.load(),
-            stt=deepgram.STT(model="nova-2"),
-            llm=openai.LLM.with_cerebras(
-                model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
-                temperature=float(os.getenv("AGENT_TEMPERATURE", "0.7")),
-                api_key=os.getenv("CEREBRAS_API_KEY"),
-            ),
-            tts=deepgram.TTS(
-                model=os.getenv("DEEPGRAM_TTS_MODEL", "aura-asteria-en"),
-                api_key=os.getenv("DEEPGRAM_API_KEY"),
-            ),
-        )
+        # Create session with Cerebras LLM; the VAD is loaded once per process in prewarm
+        session = AgentSession(vad=shared_vad(ctx), stt=stt, llm=llm, tts=tts)
         
         # Set up context
         today = datetime.now().strftime("%B %d, %Y")
@@ -93,6 +97,7 @@ async def interview_entrypoint(ctx: JobContext):
         
         # Start session
         await session.start(agent=assistant, room=ctx.room)
+        timer.mark("session_started")
         
         logger.info("Generating initial greeting...")
         
@@ -104,7 +109,9 @@ async def interview_entrypoint(ctx: JobContext):
         if initial_msg:
             chat_ctx.add_message(role="assistant", content=initial_msg)
             await session.speak(initial_msg)
+            timer.mark("first_greeting")
             logger.info("Spoke initial greeting")
+        timer.log()
         
         # Main conversation loop
         logger.info("Entering main conversation loop...")
@@ -163,6 +170,7 @@ if __name__ == "__main__":
     agents.cli.run_app(
         WorkerOptions(
             request_handler=request_handler,
+            prewarm_fnc=prewarm,
             api_key=api_key,
             api_secret=api_secret,
             ws_url=ws_url,
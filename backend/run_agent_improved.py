@@ -2,6 +2,7 @@
 """
 Improved agent runner with better audio and interview features.
 """
+import asyncio
 import os
 import sys
 import logging
@@ -21,18 +22,68 @@ logger = logging.getLogger(__name__)
 
 from livekit import agents
 from livekit.agents import JobContext, WorkerOptions, JobRequest
+from app.agents.context import RollingContext
 from app.agents.interviewer import Assistant
-from livekit.agents import ChatContext, AgentSession
-from livekit.plugins import deepgram, openai, silero
+from app.agents.pipeline import speak_streamed, speak_tokens
+from app.agents.plan import default_instructions, load_plan, shared_plan_cache
+from app.agents.speculative import SpeculativeReplier
+from app.agents.tracing import TurnTracer
+from app.agents.tts_cache import CachedSpeaker, shared_audio_cache
+from app.agents.warmup import JobTimer, prewarm, shared_vad, warm_connections
+from livekit.agents import AgentSession
+from livekit.plugins import deepgram, openai
 from livekit.agents.voice_assistant import VoiceAssistant
 
+# Same words in every interview, so the audio comes from the TTS cache after the first room
+GREETING = (
+    "Hi, I'm your interviewer today, thanks for joining. "
+    "To start, could you tell me a little about yourself and your background?"
+)
 
 async def improved_interview_entrypoint(ctx: JobContext):
     """Enhanced interview agent with better audio and features."""
     logger.info(f"Agent joining room: {ctx.room.name}")
+    timer = JobTimer(ctx)
+    # Set as they are created; the finally below cleans up whatever exists
+    plan_task = context = speaker = speculator = None
     
     try:
+        # IMPROVED: Use faster STT model
+        stt = deepgram.STT(
+            model="nova-2-general",  # Faster than nova-2
+            language="en",
+            smart_format=True,
+            punctuation=True,
+        )
+        # IMPROVED: Better LLM configuration
+        model = os.getenv("CEREBRAS_MODEL", "llama3.3-70b")
+        llm = openai.LLM.with_cerebras(
+            model=model,
+            temperature=0.8,  # Slightly more creative
+            # Planned turns only react and ask the next question; see the fallback below
+            max_tokens=int(os.getenv("AGENT_TURN_MAX_TOKENS", "80")),
+            api_key=os.getenv("CEREBRAS_API_KEY"),
+        )
+        # One larger call per room (or none, when cached) writes the question bank
+        planner = openai.LLM.with_cerebras(
+            model=model,
+            temperature=0.4,
+            max_tokens=int(os.getenv("AGENT_PLAN_MAX_TOKENS", "800")),
+            api_key=os.getenv("CEREBRAS_API_KEY"),
+        )
+        # IMPROVED: Faster TTS model
+        tts_model, tts_voice, tts_speed = "aura-asteria-en", "asteria", 1.1
+        tts = deepgram.TTS(
+            model=tts_model,  # Faster than aura-2-thalia
+            voice=tts_voice,
+            speed=tts_speed,  # Slightly faster speech
+            api_key=os.getenv("DEEPGRAM_API_KEY"),
+        )
+        # Open provider connections while we join the room
+        warm_connections(stt, llm, tts)
+        
         await ctx.connect()
+        timer.mark("connected")
         logger.info("Connected to room")
         
         # Get room metadata
@@ -59,37 +110,21 @@ async def improved_interview_entrypoint(ctx: JobContext):
         if not candidate_context:
             candidate_context = "Experienced software engineer with Python and web development skills."
         
+        # The interview plan is prepared while the session starts and the greeting plays
+        plan_task = asyncio.create_task(
+            load_plan(shared_plan_cache(ctx), planner, job_context, candidate_context, model)
+        )
+        
         logger.info("Creating improved agent session...")
         
-        # IMPROVED: Better audio configuration
-        session = AgentSession(
-            vad=silero.VAD.load(),
-            # IMPROVED: Use faster STT model
-            stt=deepgram.STT(
-                model="nova-2-general",  # Faster than nova-2
-                language="en",
-                smart_format=True,
-                punctuation=True,
-            ),
-            # IMPROVED: Better LLM configuration
-            llm=openai.LLM.with_cerebras(
-                model=os.getenv("CEREBRAS_MODEL", "llama3.3-70b"),
-                temperature=0.8,  # Slightly more creative
-                max_tokens=150,   # Keep responses concise
-                api_key=os.getenv("CEREBRAS_API_KEY"),
-            ),
-            # IMPROVED: Faster TTS model
-            tts=deepgram.TTS(
-                model="aura-asteria-en",  # Faster than aura-2-thalia
-                voice="asteria",
-                speed=1.1,  # Slightly faster speech
-                api_key=os.getenv("DEEPGRAM_API_KEY"),
-            ),
-        )
+        # IMPROVED: Better audio configuration; the VAD is loaded once per process in prewarm
+        session = AgentSession(vad=shared_vad(ctx), stt=stt, llm=llm, tts=tts)
+        # Per-turn latency spans; the session summary is written when the room closes
+        tracer = TurnTracer.from_env(session, ctx.room.name)
+        ctx.add_shutdown_callback(tracer.aclose)
         
         # IMPROVED: Better interview context
         today = datetime.now().strftime("%B %d, %Y")
-        chat_ctx = ChatContext()
         
         # More detailed context for better interviews
         interview_prompt = f"""
@@ -112,81 +147,96 @@ async def improved_interview_entrypoint(ctx: JobContext):
         7. Be encouraging and professional
         8. Take notes mentally on their responses
         """
+        # Once the questions are planned, turns no longer need the job details and resume
+        planned_prompt = f"""
+        You are conducting a professional job interview for the position of {job_context.get('job_title', 'Software Engineer')}.
+        Today's date: {today}
+        Ask the questions you are given, one at a time. Keep responses concise (1-2 sentences),
+        encouraging and professional.
+        """
         
-        chat_ctx.add_message(role="system", content=interview_prompt)
+        # Bounded prompt: the system prompt and the last few turns verbatim, older
+        # turns folded into a running summary in the background
+        context = RollingContext.from_env([("system", interview_prompt)])
         
         # Create assistant with improved instructions
-        assistant = Assistant(chat_ctx=chat_ctx)
+        assistant = Assistant(chat_ctx=context.chat_ctx())
         
         logger.info("Starting improved agent session...")
         await session.start(agent=assistant, room=ctx.room)
+        timer.mark("session_started")
         
-        # IMPROVED: Better initial greeting
-        initial_msg = await session.generate_reply(
-            instructions="""
-            Greet the candidate warmly and introduce yourself as their interviewer.
-            Ask them to tell you about themselves and their background.
-            Keep it conversational and welcoming. One sentence only.
-            """
+        # IMPROVED: Fixed greeting, played from the worker's TTS cache when possible
+        speaker = CachedSpeaker(
+            session, tts, shared_audio_cache(ctx), model=tts_model, voice=tts_voice, speed=tts_speed
         )
-        
-        if initial_msg:
-            chat_ctx.add_message(role="assistant", content=initial_msg)
-            await session.speak(initial_msg)
-            logger.info("Spoke initial greeting")
+        await speaker.say(GREETING)
+        context.add("assistant", GREETING)
+        timer.mark("first_greeting")
+        logger.info("Spoke initial greeting")
+        timer.log()
         
         # IMPROVED: Enhanced conversation loop with interview phases
-        conversation_phase = "introduction"
         question_count = 0
+        plan = await plan_task
+        if plan is not None:
+            context.pinned = [("system", planned_prompt)]
+        else:
+            # Phase guidance asks for fuller replies than a planned question, so keep the old cap
+            llm = openai.LLM.with_cerebras(
+                model=model,
+                temperature=0.8,
+                max_tokens=int(os.getenv("AGENT_UNPLANNED_MAX_TOKENS", "150")),
+                api_key=os.getenv("CEREBRAS_API_KEY"),
+            )
+        
+        # Drafts replies from interim transcripts while the candidate is still speaking
+        speculator = SpeculativeReplier.from_env(session, llm, context)
         
         logger.info("Entering enhanced conversation loop...")
         
         while ctx.room.connection_state == "connected":
+            turn = question_count + 1
+            instructions = plan.instructions(turn) if plan is not None else default_instructions(turn)
+            if speculator is not None:
+                speculator.instructions = instructions
             user_input = await session.listen()
             if user_input:
                 logger.info(f"User said: {user_input[:50]}...")
-                chat_ctx.add_message(role="user", content=user_input)
+                context.add("user", user_input)
+                await context.apply(assistant)
                 question_count += 1
                 
-                # IMPROVED: Context-aware responses based on interview phase
-                if question_count <= 2:
-                    # Introduction phase
-                    instructions = """
-                    Ask follow-up questions about their background, education, or previous experience.
-                    Show interest in their journey. Keep responses encouraging and brief.
-                    """
-                elif question_count <= 5:
-                    # Technical/experience phase
-                    instructions = """
-                    Ask about specific technical skills, projects, or achievements mentioned in their resume.
-                    Use the STAR method (Situation, Task, Action, Result) for behavioral questions.
-                    Keep responses concise and engaging.
-                    """
-                elif question_count <= 7:
-                    # Deep dive phase
-                    instructions = """
-                    Ask about challenges they've faced, how they handle teamwork, or their career goals.
-                    Show genuine interest in their problem-solving abilities.
-                    Keep responses brief and encouraging.
-                    """
+                draft = await speculator.take(user_input) if speculator is not None else None
+                # Each sentence goes to TTS as soon as the LLM (or the draft) finishes it
+                if draft is not None:
+                    tracer.tag("speculative", True)
+                    reply = await speak_tokens(session, draft, tracer)
                 else:
-                    # Wrap-up phase
-                    instructions = """
-                    Ask if they have any questions about the role or company.
-                    Thank them for their time and provide next steps.
-                    Keep responses brief and professional.
-                    """
-                
-                response = await session.generate_reply(instructions=instructions)
+                    reply = await speak_streamed(session, llm, context.chat_ctx(instructions), tracer)
+                # After a barge-in this is only what was generated before playback stopped
+                response = reply.text
                 
                 if response:
-                    chat_ctx.add_message(role="assistant", content=response)
-                    await session.speak(response)
+                    context.add("assistant", response)
                     logger.info(f"Agent responded: {response[:50]}...")
                     
     except Exception as e:
         logger.error(f"Error in agent: {e}", exc_info=True)
         raise
+    finally:
+        if plan_task is not None:
+            # Still running if the session failed before the plan was needed
+            plan_task.cancel()
+            await asyncio.gather(plan_task, return_exceptions=True)
+        if speculator is not None:
+            speculator.close()
+            logger.info(f"Speculation: {speculator.stats()}")
+        if context is not None:
+            await context.aclose()
+            logger.info(f"Context tokens per turn: {context.turn_tokens}")
+        if speaker is not None:
+            logger.info(f"TTS cache: {speaker.cache.stats()}")
 
 
 async def request_handler(request: JobRequest) -> None:
@@ -217,6 +267,7 @@ if __name__ == "__main__":
     agents.cli.run_app(
         WorkerOptions(
             request_handler=request_handler,
+            prewarm_fnc=prewarm,
             api_key=api_key,
             api_secret=api_secret,
             ws_url=ws_url,